@@ -28,84 +28,86 @@ __copyright__ = """
 from collections import namedtuple
 
 from objutils.registry import Registry
+from objutils.utils import createStringBuffer
+import objutils.prober as prober
 
 reg = Registry()
 
 ##
-##  Register codecs.
+##  Register codecs (modules are imported on first use).
 ##
-import objutils.sig
-reg.register('sig', objutils.sig.Reader, objutils.sig.Writer, "Signetics format.")
+reg.registerLazy('sig', 'objutils.sig', "Signetics format.")
 
-import objutils.srec
-reg.register('srec', objutils.srec.Reader, objutils.srec.Writer, "Motorola S-Records (a.k.a. S19).")
+reg.registerLazy('srec', 'objutils.srec', "Motorola S-Records (a.k.a. S19).")
 
-import objutils.titxt
-reg.register('titxt', objutils.titxt.Reader, objutils.titxt.Writer, "Texas Instruments MSP430 text format.")
+reg.registerLazy('titxt', 'objutils.titxt', "Texas Instruments MSP430 text format.")
 
-import objutils.emon52
-reg.register('emon52', objutils.emon52.Reader, objutils.emon52.Writer, "Elektor Monitor (EMON52) file format.")
+reg.registerLazy('emon52', 'objutils.emon52', "Elektor Monitor (EMON52) file format.")
 
 #import objutils.elf
 # TODO!!!
 
-import objutils.etek
-reg.register('etek', objutils.etek.Reader, objutils.etek.Writer, "Extended Tektonix format.")
+reg.registerLazy('etek', 'objutils.etek', "Extended Tektonix format.")
 
-import objutils.fpc
-reg.register('fpc', objutils.fpc.Reader, objutils.fpc.Writer, "Four packed code file format.")
+reg.registerLazy('fpc', 'objutils.fpc', "Four packed code file format.")
 
 #import objutils.ieee695
 # TODO!!!
 
-import objutils.ihex
-reg.register('ihex', objutils.ihex.Reader, objutils.ihex.Writer, "Intel IHex format.")
+reg.registerLazy('ihex', 'objutils.ihex', "Intel IHex format.")
 
-import objutils.mostec
-reg.register('mostec', objutils.mostec.Reader, objutils.mostec.Writer, "MOSTech format.")
+reg.registerLazy('mostec', 'objutils.mostec', "MOSTech format.")
 
-import objutils.rca
-reg.register('rca', objutils.rca.Reader, objutils.rca.Writer, "RCA format.")
+reg.registerLazy('rca', 'objutils.rca', "RCA format.")
 
-import objutils.tek
-reg.register('tek', objutils.tek.Reader, objutils.tek.Writer, "Tektonix format.")
+reg.registerLazy('tek', 'objutils.tek', "Tektonix format.")
 
-import objutils.cosmac
-reg.register('cosmac', objutils.cosmac.Reader, objutils.cosmac.Writer, "RCA COSMAC format.")
+reg.registerLazy('cosmac', 'objutils.cosmac', "RCA COSMAC format.")
 
-import objutils.ash
-reg.register('ash', objutils.ash.Reader, objutils.ash.Writer, "ASCII hex space formats.")
+reg.registerLazy('ash', 'objutils.ash', "ASCII hex space formats.")
+
+reg.registerLazy('oui', 'objutils.oui', "Objutils binary image container.")
+
+reg.registerLazy('hexdump', 'objutils.hexdumpcodec', "Canonical hexdump.")
 
 ##
 ##  Interface to objutils.
 ##
-def load(codecName, *args, **kws):
-    return reg.get(codecName).Reader().load(*args, **kws)
+def load(codecName, fp, cache = None, **kws):
+    handle = reg.handle(codecName)
+    if cache is not None:
+        return cache.load(codecName, fp, lambda f: handle.load(f, **kws))
+    return handle.load(fp, **kws)
 
 def loads(codecName, *args, **kws):
-    return reg.get(codecName).Reader().loads(*args, **kws)
-
-def probe(*args, **kws):
-    found = False
-    for name, codec in reg._codecs.items():
-        reader = codec.Reader()
-        found = reader.probe(*args, **kws)
-        if found:
-            break
-    return reader.codecName if found else None
-
-def probes(*args, **kws):
-    found = False
-    for name, codec in reg:
-        reader = codec.Reader()
-        found = reader.probes(*args, **kws)
-        if found:
-            break
-    return reader.codecName if found else None
+    return reg.handle(codecName).loads(*args, **kws)
+
+def load_iter(codecName, *args, **kws):
+    return reg.get(codecName).Reader().iter_sections(*args, **kws)
+
+def probe(fp):
+    return prober.probe(reg, fp)
+
+def probes(data):
+    if not isinstance(data, bytes):
+        data = data.encode("ascii")
+    return probe(createStringBuffer(data))
+
+def probe_candidates(fp):
+    header = prober.readHeader(fp, prober.PROBE_SIZE + 1)
+    return prober.candidates(reg, header[ : prober.PROBE_SIZE], len(header) <= prober.PROBE_SIZE)
+
+def merge(images, policy = "error"):
+    from objutils.image import merge
+    return merge(images, policy)
+
+def checksum(image, algorithm = "CRC-32", address = None, length = None, fill = 0xff):
+    from objutils.crc import imageChecksum
+    return imageChecksum(algorithm, image, address, length, fill)
 
 def dump(codecName, *args, **kws):
-    reg.get(codecName).Writer().dump(*args, **kws)
+    reg.handle(codecName).dump(*args, **kws)
 
 def dumps(codecName, *args, **kws):
-    return reg.get(codecName).Writer().dumps(*args, **kws)
+    return reg.handle(codecName).dumps(*args, **kws)
 
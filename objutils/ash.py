@@ -50,6 +50,7 @@ checksum = partial(lrc, width = 16)
 class Reader(hexfile.ASCIIHexReader):
     """
     """
+    SIGNATURES = (b'\x02', b'$A')
     VALID_CHARS = re.compile(r"^[a-fA-F0-9 %,\'\$\x02\x03\n\r]*$")
 
     def __init__(self, addressPattern = r'^(?:(?P<stx>[\x02])\s+)?\$A(?P<address>[0-9a-zA-Z]{2,8})[,.]\s*$',
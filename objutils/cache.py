@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__version__ = "0.1.0"
+
+__copyright__ = """
+    pyObjUtils - Object file library for Python.
+
+   (C) 2010-2016 by Christoph Schueler <cpu12.gems@googlemail.com>
+
+   All Rights Reserved
+
+  This program is free software; you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation; either version 2 of the License, or
+  (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+
+  You should have received a copy of the GNU General Public License along
+  with this program; if not, write to the Free Software Foundation, Inc.,
+  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+
+##
+##  Opt-in on-disk cache of parsed images.
+##
+##  Usage: `objutils.load("ihex", fp, cache = ImageCache("/tmp/objutils"))`.
+##
+
+import hashlib
+import os
+import struct
+import tempfile
+
+from objutils.logger import Logger
+from objutils.oui import InvalidContainerError
+from objutils.pickleif import PickleIF, DUMMY_PROTOCOL
+from objutils.utils import createStringBuffer
+import objutils.oui as oui
+
+CACHE_SIZE = 1024 * 1024 * 1024     # Default upper bound of the cache directory, in bytes.
+SUFFIX = ".oui"
+HASH_BLOCK_SIZE = 1024 * 1024
+
+KEY_STAT = "stat"   # Files are identified by path, size and modification time,
+KEY_HASH = "hash"   # or by a hash of their contents.
+
+_replace = getattr(os, 'replace', os.rename)
+
+CacheFormatError = InvalidContainerError
+
+
+class ImagePickler(PickleIF):
+    """Images in the OUI container format (see `objutils.oui`); images loaded from
+    files are memory-mapped, their sections are `memoryview`s into the mapping.
+    """
+
+    def dump(self, obj, file_, protocol = DUMMY_PROTOCOL):
+        oui.Writer().dump(file_, obj)
+
+    def dumps(self, obj, protocol = DUMMY_PROTOCOL):
+        return oui.Writer().dumps(obj)
+
+    def load(self, file_):
+        return oui.Reader().load(file_)
+
+    def loads(self, string_):
+        return oui.Reader().loads(string_)
+
+
+class ImageCache(object):
+    """Directory of pickled images, keyed by codec name and source file.
+
+    The directory is kept below `maxSize` bytes by evicting the least recently used images.
+    """
+
+    def __init__(self, directory, maxSize = CACHE_SIZE, keyMode = KEY_STAT):
+        if keyMode not in (KEY_STAT, KEY_HASH):
+            raise ValueError("Invalid key mode '{0!s}'.".format(keyMode))
+        self.directory = directory
+        self.maxSize = maxSize
+        self.keyMode = keyMode
+        self.pickler = ImagePickler()
+        self.logger = Logger("ImageCache")
+        self.hits = self.misses = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def load(self, codecName, fp, loader):
+        """Cached image of `fp`, else the result of `loader(fp)`, which is then added to the cache.
+        """
+        key, data = self.key(codecName, fp)
+        path = self.path(key)
+        image = self._fetch(path)
+        if image is not None:
+            self.hits += 1
+            return image
+        self.misses += 1
+        image = loader(fp if data is None else createStringBuffer(data))
+        if image.valid or image.sections:
+            self._store(path, image)
+        return image
+
+    def key(self, codecName, fp):
+        """Returns `(key, data)`, `data` is the content of `fp` if it had to be read for hashing.
+        """
+        hasher = hashlib.sha1(codecName.encode("ascii") + b'\x00')
+        name = getattr(fp, 'name', None)
+        if self.keyMode == KEY_STAT and isinstance(name, str) and os.path.isfile(name):
+            stat = os.stat(name)
+            mtime = getattr(stat, 'st_mtime_ns', stat.st_mtime)
+            hasher.update("{0}\x00{1:d}\x00{2!r}".format(os.path.abspath(name), stat.st_size, mtime).encode("utf-8"))
+            return hasher.hexdigest(), None
+        data = fp.read()
+        if not isinstance(data, bytes):
+            data = data.encode("utf-8")
+        for offset in range(0, len(data), HASH_BLOCK_SIZE):
+            hasher.update(data[offset : offset + HASH_BLOCK_SIZE])
+        return hasher.hexdigest(), data
+
+    def path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def invalidate(self, codecName = None, fp = None):
+        """Remove the entry for `codecName` and `fp`, or all entries if called without arguments.
+        """
+        if codecName is None:
+            for path, _, _ in self.entries():
+                self._remove(path)
+        else:
+            key, _ = self.key(codecName, fp)
+            self._remove(self.path(key))
+
+    clear = invalidate
+
+    def entries(self):
+        """`(path, size, lastUse)` of all cached images.
+        """
+        result = []
+        for name in os.listdir(self.directory):
+            if name.endswith(SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue    # Concurrently removed.
+                result.append((path, stat.st_size, stat.st_mtime))
+        return result
+
+    @property
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        entries = sorted(self.entries(), key = lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.maxSize:
+                break
+            self._remove(path)
+            total -= size
+
+    def _fetch(self, path):
+        try:
+            with open(path, "rb") as fp:
+                image = self.pickler.load(fp)
+        except (IOError, OSError):
+            return None
+        except (CacheFormatError, ValueError, struct.error) as e:
+            self.logger.warn("Discarding corrupted cache entry '{0}': {1}".format(path, e))
+            self._remove(path)
+            return None
+        os.utime(path, None)    # Modification time is our LRU clock.
+        return image
+
+    def _store(self, path, image):
+        handle, tmpName = tempfile.mkstemp(suffix = ".tmp", dir = self.directory)
+        try:
+            with os.fdopen(handle, "wb") as fp:
+                self.pickler.dump(image, fp)
+            _replace(tmpName, path)
+        except Exception:
+            self._remove(tmpName)
+            raise
+        self.evict()
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
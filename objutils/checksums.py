@@ -28,10 +28,17 @@ __copyright__ = """
 import operator
 import functools
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 COMPLEMENT_NONE = 0
 COMPLEMENT_ONES = 1
 COMPLEMENT_TWOS = 2
 
+BYTES_LIKE = (bytes, bytearray, memoryview)
+
 def lrc(data, width, comp = COMPLEMENT_NONE):
     """Longitudinal redundancy check.
     """
@@ -40,6 +47,10 @@ def lrc(data, width, comp = COMPLEMENT_NONE):
 
     cs = sum(data) % mask
 
+    return _complement(cs, mask, comp)
+
+
+def _complement(cs, mask, comp):
     if comp == COMPLEMENT_NONE:
         pass
     elif comp == COMPLEMENT_ONES:
@@ -74,20 +85,89 @@ def xor(frame, invert = True):
 ROTATE_LEFT = rolb
 ROTATE_RIGHT = rorb
 
+##
+##  Lookup tables.
+##
+NIBBLE_SUMS = bytearray(((b & 0xf0) >> 4) + (b & 0x0f) for b in range(256))
+
+ROTATE_TABLES = {
+    ROTATE_LEFT:    tuple(rolb(b) for b in range(256)),
+    ROTATE_RIGHT:   tuple(rorb(b) for b in range(256)),
+}
+
 def rotatedXOR(values, width, rotator):
     """Rotated XOR cipher.
     """
     cs = 0
-    for value in values:
-        cs ^= value
-        cs = rotator(cs)
+    table = ROTATE_TABLES.get(rotator)
+    if table is None:
+        for value in values:
+            cs ^= value
+            cs = rotator(cs)
+    else:
+        for value in values:
+            cs = table[(cs ^ value) & 0xff]
     return cs  % (2 ** width)
 
 def nibbleSum(data):
+    if isinstance(data, BYTES_LIKE):
+        return sum(bytearray(data).translate(NIBBLE_SUMS)) % 256
     result = 0
     for d in data:
-        hn = (d & 0xf0) >> 4
-        ln = d & 0x0f
-        result +=  hn + ln
+        result += NIBBLE_SUMS[d & 0xff]
     return result % 256
 
+##
+##  Bulk interface, checksums of many records (`bytes`, `bytearray` or `memoryview`) in one call.
+##  Uses NumPy if available.
+##
+def lrcRecords(records, width, comp = COMPLEMENT_NONE):
+    if numpy is None:
+        return [lrc(record, width, comp) for record in records]
+    mask = (2 ** width)
+    return [_complement(cs, mask, comp) for cs in (_recordSums(*_concatRecords(records)) % mask).tolist()]
+
+
+def nibbleSumRecords(records):
+    if numpy is None:
+        return [nibbleSum(record) for record in records]
+    buf, lengths = _concatRecords(records)
+    table = numpy.frombuffer(NIBBLE_SUMS, dtype = numpy.uint8)
+    return (_recordSums(table[buf], lengths) % 256).tolist()
+
+
+def rotatedXORRecords(records, width, rotator):
+    table = ROTATE_TABLES.get(rotator)
+    if numpy is None or table is None:
+        return [rotatedXOR(record, width, rotator) for record in records]
+    buf, lengths = _concatRecords(records)
+    count = len(lengths)
+    if not count:
+        return []
+    # Records are right aligned, leading zeros don't change the checksum.
+    columns = int(lengths.max())
+    matrix = numpy.zeros((count, columns), dtype = numpy.uint8)
+    rows = numpy.repeat(numpy.arange(count), lengths)
+    starts = numpy.cumsum(lengths) - lengths
+    cols = numpy.arange(len(buf)) - numpy.repeat(starts, lengths) + numpy.repeat(columns - lengths, lengths)
+    matrix[rows, cols] = buf
+    table = numpy.array(table, dtype = numpy.uint8)
+    cs = numpy.zeros(count, dtype = numpy.uint8)
+    for column in range(columns):
+        cs = table[cs ^ matrix[ : , column]]
+    return (cs.astype(numpy.uint64) % (2 ** width)).tolist()
+
+
+def _concatRecords(records):
+    records = [r if isinstance(r, BYTES_LIKE) else bytearray(r) for r in records]
+    buf = numpy.frombuffer(b''.join(records), dtype = numpy.uint8)
+    lengths = numpy.array([len(r) for r in records], dtype = numpy.int64)
+    return buf, lengths
+
+
+def _recordSums(buf, lengths):
+    sums = numpy.zeros(len(buf) + 1, dtype = numpy.uint64)
+    numpy.cumsum(buf, dtype = numpy.uint64, out = sums[1 : ])
+    ends = numpy.cumsum(lengths)
+    return sums[ends] - sums[ends - lengths]
+
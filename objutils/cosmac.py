@@ -37,6 +37,7 @@ DATA3    = 4
 
 class Reader(hexfile.Reader):
 
+    SIGNATURES = (b'!M', b'?M')
     FORMAT_SPEC = (
         (DATA0,  "!MAAAA DD"),
         (DATA1,  "\?MAAAA DD"),
@@ -46,6 +47,10 @@ class Reader(hexfile.Reader):
     previousAddress = 0
     previousLength = 0
 
+    def resetState(self):
+        self.previousAddress = 0
+        self.previousLength = 0
+
     def checkLine(self, line, formatType):
         return True
 
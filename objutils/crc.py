@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__version__ = "0.1.0"
+
+__copyright__ = """
+    pyObjUtils - Object file library for Python.
+
+   (C) 2010-2016 by Christoph Schueler <cpu12.gems@googlemail.com>
+
+   All Rights Reserved
+
+  This program is free software; you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation; either version 2 of the License, or
+  (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+
+  You should have received a copy of the GNU General Public License along
+  with this program; if not, write to the Free Software Foundation, Inc.,
+  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+
+##
+##  Table driven CRCs (and friends) over byte strings, sections and images.
+##
+##  All algorithms share a small interface: `update(data)` may be called any number of times,
+##  `value` is the checksum of the data seen so far.
+##
+
+from collections import namedtuple
+import itertools
+import struct
+import zlib
+
+CRCParameters = namedtuple("CRCParameters", "width poly refin refout init xorout")
+
+CRC16_CCITT = CRCParameters(16, 0x1021, False, False, 0xffff, 0x0000)    # a.k.a. CRC-16/CCITT-FALSE.
+CRC16_ARC   = CRCParameters(16, 0x8005, True, True, 0x0000, 0x0000)
+CRC32       = CRCParameters(32, 0x04c11db7, True, True, 0xffffffff, 0xffffffff)
+CRC32C      = CRCParameters(32, 0x1edc6f41, True, True, 0xffffffff, 0xffffffff)
+
+SLICE_SIZE  = 8         # Bytes per step of the bulk path (slicing-by-8).
+FILL_CHUNK  = 64 * 1024 # Gap-fill is fed in pieces of this size.
+
+
+def reflect(value, width):
+    result = 0
+    for _ in range(width):
+        result = (result << 1) | (value & 1)
+        value >>= 1
+    return result
+
+
+_tables = {}
+
+def tables(params):
+    """The eight slicing tables for `params` (table 0 is the classic byte-wise table), computed only once.
+    """
+    if params not in _tables:
+        width = params.width
+        mask = (1 << width) - 1
+        table = []
+        if params.refin:
+            poly = reflect(params.poly, width)
+            for byte in range(256):
+                crc = byte
+                for _ in range(8):
+                    crc = (crc >> 1) ^ poly if crc & 1 else crc >> 1
+                table.append(crc)
+            result = [table]
+            for _ in range(SLICE_SIZE - 1):
+                previous = result[-1]
+                result.append([(crc >> 8) ^ table[crc & 0xff] for crc in previous])
+        else:
+            top = 1 << (width - 1)
+            for byte in range(256):
+                crc = byte << (width - 8)
+                for _ in range(8):
+                    crc = ((crc << 1) ^ params.poly if crc & top else crc << 1) & mask
+                table.append(crc)
+            result = [table]
+            for _ in range(SLICE_SIZE - 1):
+                previous = result[-1]
+                result.append([((crc << 8) & mask) ^ table[crc >> (width - 8)] for crc in previous])
+        _tables[params] = tuple(tuple(t) for t in result)
+    return _tables[params]
+
+
+class CRC(object):
+    """CRC with arbitrary parameters (`width` must be a multiple of 8, up to 64 bits).
+
+    CRC-32 is delegated to `zlib.crc32`, all others use slicing-by-8 tables.
+    """
+
+    def __init__(self, params):
+        if params.width % 8 or not 8 <= params.width <= 64:
+            raise ValueError("CRC width must be a multiple of 8 between 8 and 64, not {0:d}.".format(params.width))
+        self.params = params
+        self._zlib = params == CRC32
+        if self._zlib:
+            self._crc = 0
+        else:
+            self._tables = tables(params)
+            self._crc = reflect(params.init, params.width) if params.refin else params.init
+
+    def update(self, data):
+        if self._zlib:
+            self._crc = zlib.crc32(data, self._crc) & 0xffffffff
+            return self
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytearray(data)
+        bulk = len(data) - len(data) % SLICE_SIZE
+        if self.params.refin:
+            crc = self._updateReflected(data, bulk)
+            table = self._tables[0]
+            for byte in bytearray(data[bulk : ]):
+                crc = (crc >> 8) ^ table[(crc ^ byte) & 0xff]
+        else:
+            crc = self._updateNormal(data, bulk)
+            table = self._tables[0]
+            width = self.params.width
+            mask = (1 << width) - 1
+            for byte in bytearray(data[bulk : ]):
+                crc = ((crc << 8) & mask) ^ table[((crc >> (width - 8)) ^ byte) & 0xff]
+        self._crc = crc
+        return self
+
+    def _updateReflected(self, data, bulk):
+        t0, t1, t2, t3, t4, t5, t6, t7 = self._tables
+        crc = self._crc
+        for word in struct.unpack("<{0:d}Q".format(bulk // 8), data[ : bulk]):
+            word ^= crc
+            crc = t7[word & 0xff] ^ t6[(word >> 8) & 0xff] ^ t5[(word >> 16) & 0xff] ^ t4[(word >> 24) & 0xff] ^ \
+                t3[(word >> 32) & 0xff] ^ t2[(word >> 40) & 0xff] ^ t1[(word >> 48) & 0xff] ^ t0[word >> 56]
+        return crc
+
+    def _updateNormal(self, data, bulk):
+        t0, t1, t2, t3, t4, t5, t6, t7 = self._tables
+        crc = self._crc
+        shift = 64 - self.params.width
+        for word in struct.unpack(">{0:d}Q".format(bulk // 8), data[ : bulk]):
+            word ^= crc << shift
+            crc = t7[word >> 56] ^ t6[(word >> 48) & 0xff] ^ t5[(word >> 40) & 0xff] ^ t4[(word >> 32) & 0xff] ^ \
+                t3[(word >> 24) & 0xff] ^ t2[(word >> 16) & 0xff] ^ t1[(word >> 8) & 0xff] ^ t0[word & 0xff]
+        return crc
+
+    @property
+    def value(self):
+        if self._zlib:
+            return self._crc
+        crc = self._crc
+        if self.params.refin != self.params.refout:
+            crc = reflect(crc, self.params.width)
+        return crc ^ self.params.xorout
+
+
+class Adler32(object):
+
+    def __init__(self):
+        self._value = 1
+
+    def update(self, data):
+        self._value = zlib.adler32(data, self._value) & 0xffffffff
+        return self
+
+    @property
+    def value(self):
+        return self._value
+
+
+class Fletcher16(object):
+    """Fletcher-16 (sums of bytes, modulo 255).
+    """
+
+    BLOCK_SIZE = 4096
+    MODULUS = 255
+    WORD_BITS = 8
+
+    def __init__(self):
+        self._sum1 = self._sum2 = 0
+
+    def update(self, data):
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytearray(data)
+        self._addWords(bytearray(data))
+        return self
+
+    def _addWords(self, words):
+        sum1, sum2 = self._sum1, self._sum2
+        for start in range(0, len(words), self.BLOCK_SIZE):
+            block = words[start : start + self.BLOCK_SIZE]
+            # sum2 grows by each intermediate sum1, i.e. by the prefix sums of the block.
+            sum2 = (sum2 + len(block) * sum1 + sum(_accumulate(block))) % self.MODULUS
+            sum1 = (sum1 + sum(block)) % self.MODULUS
+        self._sum1, self._sum2 = sum1, sum2
+
+    @property
+    def value(self):
+        return (self._sum2 << self.WORD_BITS) | self._sum1
+
+
+class Fletcher32(Fletcher16):
+    """Fletcher-32 (sums of little endian 16-bit words, modulo 65535); odd data is padded with a zero byte.
+
+    A trailing odd byte is kept until the next `update()`, so updates may be of any size.
+    """
+
+    MODULUS = 65535
+    WORD_BITS = 16
+
+    def __init__(self):
+        super(Fletcher32, self).__init__()
+        self._pending = None    # Low byte of an incomplete word.
+
+    def update(self, data):
+        if not isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytearray(data)
+        data = memoryview(data)
+        words = []
+        offset = 0
+        if self._pending is not None and len(data):
+            words.append(self._pending | (bytearray(data[ : 1])[0] << 8))
+            self._pending = None
+            offset = 1
+        count = (len(data) - offset) // 2
+        words.extend(struct.unpack_from("<{0:d}H".format(count), data, offset))
+        offset += count * 2
+        if offset < len(data):
+            self._pending = bytearray(data[offset : ])[0]
+        self._addWords(words)
+        return self
+
+    @property
+    def value(self):
+        sum1, sum2 = self._sum1, self._sum2
+        if self._pending is not None:
+            sum1 = (sum1 + self._pending) % self.MODULUS
+            sum2 = (sum2 + sum1) % self.MODULUS
+        return (sum2 << self.WORD_BITS) | sum1
+
+
+def _accumulate(values):
+    try:
+        return itertools.accumulate(values)
+    except AttributeError:  # Python 2.
+        total = 0
+        result = []
+        for value in values:
+            total += value
+            result.append(total)
+        return result
+
+
+ALGORITHMS = {
+    "CRC-16/CCITT":     lambda: CRC(CRC16_CCITT),
+    "CRC-16/ARC":       lambda: CRC(CRC16_ARC),
+    "CRC-32":           lambda: CRC(CRC32),
+    "CRC-32C":          lambda: CRC(CRC32C),
+    "ADLER-32":         Adler32,
+    "FLETCHER-16":      Fletcher16,
+    "FLETCHER-32":      Fletcher32,
+}
+
+
+def create(algorithm):
+    """Checksum object for `algorithm`, which is a name from `ALGORITHMS` or `CRCParameters`.
+    """
+    if isinstance(algorithm, CRCParameters):
+        return CRC(algorithm)
+    try:
+        return ALGORITHMS[algorithm.upper()]()
+    except KeyError:
+        raise ValueError("Unknown checksum algorithm '{0!s}'.".format(algorithm))
+
+
+def checksum(algorithm, data):
+    return create(algorithm).update(data).value
+
+
+def imageChecksum(algorithm, image, address = None, length = None, fill = 0xff):
+    """Checksum of `image` over [`address`, `address` + `length`) (default: from the first to the last byte).
+
+    Sections are fed as zero-copy views, gaps as `fill` bytes or skipped, if `fill` is None.
+    """
+    crc = create(algorithm)
+    sections = sorted(image.sections, key = lambda s: s.address)
+    if not sections:
+        return crc.value
+    if address is None:
+        address = sections[0].address
+    if length is None:
+        length = max(s.address + s.length for s in sections) - address
+    end = address + length
+    position = address
+    for section in sections:
+        start, stop = max(section.address, position), min(section.address + section.length, end)
+        if start >= stop:
+            continue
+        if start > position and fill is not None:
+            _feedFill(crc, fill, start - position)
+        crc.update(memoryview(section.data)[start - section.address : stop - section.address])
+        position = stop
+    if position < end and fill is not None:
+        _feedFill(crc, fill, end - position)
+    return crc.value
+
+
+def _feedFill(crc, fill, count):
+    chunk = bytearray([fill]) * min(count, FILL_CHUNK)
+    while count:
+        size = min(count, len(chunk))
+        crc.update(chunk if size == len(chunk) else chunk[ : size])
+        count -= size
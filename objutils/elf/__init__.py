@@ -66,6 +66,23 @@ class Alias(object):
         raise AttributeError("can't delete attribute")
 
 
+class LazyProperty(object):
+    """Computed on first access, then cached as instance attribute.
+    """
+
+    def __init__(self, method):
+        self.method = method
+        self.__doc__ = method.__doc__
+        self.__name__ = method.__name__
+
+    def __get__(self, obj, objtype = None):
+        if obj is None:
+            return self
+        value = self.method(obj)
+        obj.__dict__[self.__name__] = value
+        return value
+
+
 class FormatError(Exception): pass
 
 
@@ -285,26 +302,55 @@ class ELFSectionHeaderTable(object):
         else:
             self.numEntries = None
 
+    @LazyProperty
+    def image(self):
         if self.shType not in (defs.SHT_NOBITS, defs.SHT_NULL) and self.shSize > 0:
-            pos = self.shOffset
-            self.image = parent.slice(pos, self.shSize)
+            return self.parent.slice(self.shOffset, self.shSize)
+        else:
+            return None
+
+    @LazyProperty
+    def symbols(self):
+        """Symbol table entries by index (symbol tables only).
+        """
+        if self.shType not in (defs.SHT_SYMTAB, defs.SHT_DYNSYM):
+            raise AttributeError("'{0}' is not a symbol table.".format(self.shName))
+        parent = self.parent
+        symbols = {}
+        format = defs.SYMTAB_FMT64 if parent.is64Bit else defs.SYMTAB_FMT32
+        attributes = defs.Elf64_Sym if parent.is64Bit else defs.Elf32_Sym
+        size = defs.ELF64_SYM_TABLE_SIZE if parent.is64Bit else defs.ELF32_SYM_TABLE_SIZE
+        image = self.image
+        for idx in range(self.shSize // size):
+            offset = idx * size
+            symbol = Attributor(format, attributes, parent.byteOrderPrefix)
+            symbol.apply(image[offset : offset + size], symbol)
+            symbol.sectionName = getSpecialSectionName(symbol.st_shndx)
+            symbols[idx] = symbol
+        return symbols
+
+    @LazyProperty
+    def relocations(self):
+        """`Relocation`s of REL/RELA sections.
+        """
+        if self.shType not in (defs.SHT_REL, defs.SHT_RELA):
+            raise AttributeError("'{0}' is not a relocation section.".format(self.shName))
+        is64Bit = self.parent.is64Bit
+        if self.shType == defs.SHT_REL:
+            format = defs.REL_FMT64 if is64Bit else defs.REL_FMT32
+            entrySize = defs.ELF_RELOCATION_SIZE64 if is64Bit else defs.ELF_RELOCATION_SIZE32
+            elfRelocation = Attributor(format, defs.Elf_Rel, self.parent.byteOrderPrefix)
         else:
-            self.image = None
-
-        if self.shType in (defs.SHT_SYMTAB, defs.SHT_DYNSYM):
-            self.symbols = {}
-            format = defs.SYMTAB_FMT64 if parent.is64Bit else defs.SYMTAB_FMT32
-            attributes = defs.Elf64_Sym if parent.is64Bit else defs.Elf32_Sym
-            size = defs.ELF64_SYM_TABLE_SIZE if parent.is64Bit else defs.ELF32_SYM_TABLE_SIZE
-            for idx, symbol in enumerate(range(self.shSize // size)):
-                offset = idx * size
-                data = self.image[offset : offset + size]
-                symbol = Attributor(format, attributes, parent.byteOrderPrefix)
-                symbol.apply(data, symbol)
-                self.symbols[idx] = symbol
-
-        if self.shType in (defs.SHT_REL, defs.SHT_RELA):
-            pass
+            format = defs.RELA_FMT64 if is64Bit else defs.RELA_FMT32
+            entrySize = defs.ELF_RELOCATION_A_SIZE64 if is64Bit else defs.ELF_RELOCATION_A_SIZE32
+            elfRelocation = Attributor(format, defs.Elf_Rela, self.parent.byteOrderPrefix)
+        image = self.image or b''
+        relocations = []
+        for offset in range(0, len(image) // entrySize * entrySize, entrySize):
+            reloc = Relocation(is64Bit)
+            elfRelocation.apply(image[offset : offset + entrySize], reloc)
+            relocations.append(reloc)
+        return relocations
 
     shAddress       = Alias("sh_addr")
     shAddressAlign  = Alias("sh_addralign")
@@ -366,6 +412,8 @@ class ELFSectionHeaderTable(object):
 
     @property
     def shName(self):
+        if self._name is None:
+            self._name = self.parent.getString(self.parent.header.elfStringTableIndex, self.shNameIdx)
         return self._name
 
     @property
@@ -421,9 +469,11 @@ class ELFProgramHeaderTable(object):
         attributes = defs.Elf64_Phdr if parent.is64Bit else defs.Elf32_Phdr
         elfHeader = Attributor(format, attributes, parent.byteOrderPrefix)
         elfHeader.apply(data, self)
-        self.image = parent.fp[self.p_offset : self.p_offset + self.p_filesz]
-        if self.p_type in (defs.PT_DYNAMIC, defs.PT_INTERP, defs.PT_NOTE, defs.PT_SHLIB, defs.PT_PHDR):
-            pass
+        self.parent = parent
+
+    @LazyProperty
+    def image(self):
+        return self.parent.slice(self.p_offset, self.p_filesz)
 
     @property
     def flags(self):
@@ -550,60 +600,37 @@ class Relocation(object):
 
 
 class Reader(object):
+    """Only the ELF header and the section header table are read up front; program headers,
+    section images, symbols, relocations and the section to segment mapping on first use.
+    """
+
     def __init__(self, filename):
         self.fp = memoryMap(filename)
         self.header = ELFHeader(self)
         self.is64Bit = self.header.is64Bit
-
-        self.programHeaders = []
-        self.sectionHeaders = []
-        self._sectionHeadersByName = {}
         self._stringCache = {}
-
         self.logger = Logger("ELF")
 
-        pos = self.header.e_phoff
-        if pos:
-            for _ in range(self.header.elfNumberOfPHs):
-                self.programHeaders.append(ELFProgramHeaderTable(self, pos))
-                pos += self.header.elfPHTEntrySize
-
+        self.sectionHeaders = []
         pos = self.header.e_shoff
         if pos:
             for _ in range(self.header.elfNumberOfSHs):
                 self.sectionHeaders.append(ELFSectionHeaderTable(self, pos))
                 pos += self.header.elfSHTEntrySize
 
-        for idx, sectionHeader in enumerate(self.sectionHeaders):
-            if sectionHeader.shType in (defs.SHT_SYMTAB, defs.SHT_DYNSYM):
-                for _, symbol in sectionHeader.symbols.items():
-                    symbol.sectionName = getSpecialSectionName(symbol.st_shndx)
-            elif sectionHeader.shType in (defs.SHT_REL, defs.SHT_RELA):
-                symtab = sectionHeader.shLink
-                sectionToModify = sectionHeader.shInfo
-                offset = 0
-
-                if sectionHeader.shType == defs.SHT_REL:
-                    format = defs.REL_FMT64 if self.is64Bit else defs.REL_FMT32
-                    entrySize = defs.ELF_RELOCATION_SIZE64 if self.is64Bit else defs.ELF_RELOCATION_SIZE32
-                    elfRelocation = Attributor(format, defs.Elf_Rel, self.byteOrderPrefix)
-                else:
-                    format = defs.RELA_FMT64 if self.is64Bit else defs.RELA_FMT32
-                    entrySize = defs.ELF_RELOCATION_A_SIZE64 if self.is64Bit else defs.ELF_RELOCATION_A_SIZE32
-                    elfRelocation = Attributor(format, defs.Elf_Rela, self.byteOrderPrefix)
-                img = sectionHeader.image
-                for pos in range(len(img) // entrySize):
-                    data = img[offset : offset + entrySize]
-                    reloc = Relocation(self.is64Bit)
-                    elfRelocation.apply(data, reloc)
-                    offset += entrySize
-            elif sectionHeader == defs.SHT_NOTE:
-                pass
-        for section in self.sectionHeaders:
-            name = self.getString(self.header.elfStringTableIndex, section.shNameIdx)
-            section._name = name
-            self._sectionHeadersByName[name] = section
-        self.createSectionToSegmentMapping()
+    @LazyProperty
+    def programHeaders(self):
+        result = []
+        pos = self.header.e_phoff
+        if pos:
+            for _ in range(self.header.elfNumberOfPHs):
+                result.append(ELFProgramHeaderTable(self, pos))
+                pos += self.header.elfPHTEntrySize
+        return result
+
+    @LazyProperty
+    def _sectionHeadersByName(self):
+        return dict((section.shName, section) for section in self.sectionHeaders)
 
     def slice(self, start, length):
         return self.fp[start : start + length]
@@ -615,12 +642,13 @@ class Reader(object):
         if (tableIndex, entry) in self._stringCache:
             return self._stringCache[(tableIndex, entry)]
         else:
-            unterminatedString = self.sectionHeaders[tableIndex].image[entry : ]
-            terminatedString = unterminatedString[ : unterminatedString.index(b'\x00')]
+            image = self.sectionHeaders[tableIndex].image
+            terminatedString = image[entry : image.index(b'\x00', entry)]
             self._stringCache[(tableIndex, entry)] = terminatedString
             return terminatedString
 
-    def createSectionToSegmentMapping(self):
+    @LazyProperty
+    def sectionsToSegments(self):
         mapping = OrderedDict()
         for idx in range(self.header.e_phnum):
             segment = self.programHeaders[idx]
@@ -629,7 +657,10 @@ class Reader(object):
                 section = self.sectionHeaders[j]
                 if not self.tbssSpecial(section, segment) and self.sectioInSegmentStrict(section, segment):
                     mapping[segment].append(section)
-        self.sectionsToSegments = mapping
+        return mapping
+
+    def createSectionToSegmentMapping(self):
+        return self.sectionsToSegments
 
     def tbssSpecial(self, sectionHeader, segment):
        return ((sectionHeader.sh_flags & defs.SHF_TLS) != 0 and sectionHeader.sh_type == defs.SHT_NOBITS and segment.p_type != defs.PT_TLS)
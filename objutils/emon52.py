@@ -50,6 +50,7 @@ class Codec(object):
 
 class Reader(hexfile.Reader):
 
+    PARALLEL_DECODING = True
     FORMAT_SPEC = (
         (hexfile.TYPE_FROM_RECORD, "LL AAAA:DD CCCC"),
     )
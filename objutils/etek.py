@@ -39,6 +39,7 @@ EOF     = 3
 
 class Reader(hexfile.Reader):
 
+    SIGNATURES = (b'%', )
     VALID_CHARS = re.compile(r"^[a-zA-Z0-9_ %\n\r]*$")    # We need to consider symbol information.
 
     FORMAT_SPEC = (
@@ -50,7 +51,7 @@ class Reader(hexfile.Reader):
     def checkLine(self, line, formatType):
         if formatType == DATA:
             line.length = (line.length / 2) - 5
-            checksum = checksums.nibbleSum(utils.makeList(utils.intToArray(line.address), 6, ((line.length + 5) * 2), line.chunk))
+            checksum = checksums.nibbleSum(utils.makeBytes(utils.intToArray(line.address), 6, ((line.length + 5) * 2), line.chunk))
             if line.length != len(line.chunk):
                 raise hexfile.InvalidRecordLengthError("Byte count doesn't match length of actual data.")
             if line.checksum!=checksum:
@@ -74,7 +75,7 @@ class Writer(hexfile.Writer):
     MAX_ADDRESS_BITS = 24
 
     def composeRow(self, address, length, row):
-        checksum = checksums.nibbleSum(utils.makeList(utils.intToArray(address), 6, ((length + 5) * 2), row))
+        checksum = checksums.nibbleSum(utils.makeBytes(utils.intToArray(address), 6, ((length + 5) * 2), row))
 
         line = "%{0:02X}6{1:02X}{2:04X}{3!s}".format((length + 5) * 2, checksum, address, Writer.hexBytes(row) )
         return line
@@ -51,6 +51,7 @@ atoi16 = partial(int, base = 16)
 
 class Reader(hexfile.Reader):
 
+    SIGNATURES = (b'$', )
     FORMAT_SPEC = (
         (DATA_ABS,  "CCLL0000AAAAAAAADD"),
         (DATA_INC,  "CCLL0001DD"),
@@ -59,9 +60,11 @@ class Reader(hexfile.Reader):
     )
 
     def decode(self, fp):
+        return '\n'.join(line.decode() for line in self.decodeLines(fp))
+
+    def decodeLines(self, fp):
         self.lastAddress = 0    # TODO: decode!
-        outLines = []
-        for line in fp.readlines():
+        for line in fp:
             line = line.strip()
             startSym, line = line[0], line[1:]
 
@@ -75,15 +78,17 @@ class Reader(hexfile.Reader):
             for quintuple in self.splitQuintuples(line):
                 value = self.convertQuintuple(quintuple)
                 values.append("{0:08X}".format(value))
-            outLines.append(''.join(values))
-        return '\n'.join(outLines)
-
-    def read(self, fp):
-        return super(Reader, self).read(
-            createStringBuffer(
-                bytearray(self.decode(fp), "ascii")
-            )
-        )
+            yield ''.join(values).encode("ascii")
+
+    def iterRecords(self, fp):
+        return super(Reader, self).iterRecords(self.decodeLines(fp))
+
+    def probeLine(self, line):
+        try:
+            line = next(self.decodeLines([line]))
+        except Exception:
+            return False
+        return super(Reader, self).probeLine(line)
 
     def convertQuintuple(self, quintuple):
         res = 0         # reduce(lambda accu, x: (accu * 85) + x, value, 0)
@@ -116,7 +121,7 @@ class Reader(hexfile.Reader):
         else:
             self.error("Invalid format type: '{0}'".format(formatType))
             tmp = 0
-        checksum = checksums.lrc(utils.makeList(tmp, line.length + 4, utils.intToArray(line.address), line.chunk), 8, checksums.COMPLEMENT_TWOS)
+        checksum = checksums.lrc(utils.makeBytes(tmp, line.length + 4, utils.intToArray(line.address), line.chunk), 8, checksums.COMPLEMENT_TWOS)
         if line.checksum != checksum:
             raise hexfile.InvalidRecordChecksumError()
 
@@ -142,29 +147,25 @@ class Writer(hexfile.Writer):
 
     def composeRow(self, address, length, row):
         tmp = 0 # TODO: format type!?
-        checksum = checksums.lrc(utils.makeList(tmp, length + 4, utils.intToArray(address), row), 8, checksums.COMPLEMENT_TWOS)
+        checksum = checksums.lrc(utils.makeBytes(tmp, length + 4, utils.intToArray(address), row), 8, checksums.COMPLEMENT_TWOS)
         if length < self.rowLength:
             lengthToPad = self.rowLength - length
-            padding = [0] * (lengthToPad)
-            row.extend(padding)
+            row = bytearray(row) + bytearray(lengthToPad)
         line = "{0:02X}{1}0000{2:08X}{3}".format(checksum, length - 2, address, Writer.hexBytes(row))
         return line
 
     def composeFooter(self, meta):
         return "00000000"
 
-    def postProcess(self, data):
-        result = []
-        for line in data.splitlines():
-            if len(line) % 4:
-                self.error("Size of line must be a multiple of 4.")
-                continue
-            res = []
-            for item in slicer(line, 8, atoi16):
-                item = self.convertQuintuple(item)
-                res.append(item)
-            result.append("{0}{1}".format(PREFIX, ''.join(res)))
-        return '\n'.join(result)
+    def postProcessLine(self, line):
+        if len(line) % 4:
+            self.error("Size of line must be a multiple of 4.")
+            return None
+        res = []
+        for item in slicer(line, 8, atoi16):
+            item = self.convertQuintuple(item)
+            res.append(item)
+        return "{0}{1}".format(PREFIX, ''.join(res))
 
     def convertQuintuple(self, value):
         result = []
@@ -26,67 +26,274 @@ __copyright__ = """
   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 """
 
-import math
+import binascii
+from array import array
+from collections import namedtuple
+import mmap
+import os
 import sys
+import weakref
+
+from objutils.utils import memoryMap
 
 
 isprintable = lambda ch: 0x1F < ch < 0x80
 
+ASCII_TABLE = bytes(bytearray(ch if isprintable(ch) else ord('.') for ch in range(256)))   # For `bytes.translate`.
+ELISION = "          *\n"
+BLOCK_ROWS = 4096   # Rows formatted (and written) at once.
+MAP_WINDOW = 16 * 1024 * 1024   # `dumpFile()` releases mapped pages in steps of this size.
+
+PYTHON3 = sys.version_info.major == 3
+
+WORD_TYPECODES = {2: 'H', 4: 'I', 8: 'Q'}   # `array` types used to swap bytes of little endian words.
+
+
+class Layout(namedtuple("Layout", "rowLength wordSize byteOrder ascii")):
+    """Row length in bytes, bytes per word (words of little endian layouts are shown as
+    values, i.e. byte swapped) and if the ASCII column is shown.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, rowLength = 16, wordSize = 1, byteOrder = "little", ascii = True):
+        if wordSize not in (1, 2, 4, 8):
+            raise ValueError("Word size must be 1, 2, 4 or 8 bytes, not {0!r}.".format(wordSize))
+        if rowLength <= 0 or rowLength % wordSize:
+            raise ValueError("Row length must be a positive multiple of the word size, not {0!r}.".format(rowLength))
+        if byteOrder not in ("little", "big"):
+            raise ValueError("Byte order must be 'little' or 'big', not {0!r}.".format(byteOrder))
+        return super(Layout, cls).__new__(cls, rowLength, wordSize, byteOrder, ascii)
+
+    @property
+    def hexWidth(self):
+        return self.rowLength // self.wordSize * (2 * self.wordSize + 1) - 1
+
+    @property
+    def swapped(self):
+        return self.wordSize > 1 and self.byteOrder == "little"
+
+
+CANONICAL = Layout()
+COMPACT = Layout(ascii = False)
+
+
 def unpack(*args):
     return args
 
+def dataView(data):
+    """Rows of `data` can be sliced from this without copying (on Python 3).
+    """
+    if sys.version_info.major == 3 and isinstance(data, (bytes, bytearray, memoryview)):
+        return memoryview(data)
+    return data
+
+def hexlify(data, groupSize = 1):
+    """Hex digits of `data`, groups of `groupSize` bytes separated by a single space.
+    """
+    try:
+        return binascii.hexlify(data, b' ', -groupSize).decode("ascii")  # Grouped from the left.
+    except TypeError:   # No separator before Python 3.8.
+        digits = binascii.hexlify(data).decode("ascii")
+        width = 2 * groupSize
+        return ' '.join(digits[idx : idx + width] for idx in range(0, len(digits), width))
+
+def swapWords(data, wordSize):
+    """`data` with the bytes of each word reversed; a trailing partial word is reversed as well.
+    """
+    data = bytes(data)
+    tail = len(data) % wordSize
+    words = array(WORD_TYPECODES[wordSize])
+    if PYTHON3:
+        words.frombytes(data[ : len(data) - tail])
+    else:
+        words.fromstring(data[ : len(data) - tail])
+    words.byteswap()
+    result = words.tobytes() if PYTHON3 else words.tostring()
+    return result + data[len(data) - tail : ][ : : -1]
+
+
 class Dumper(object):
 
-    def __init__(self, fp = sys.stdout, numAddressBits = 32):
+    def __init__(self, fp = sys.stdout, numAddressBits = 32, layout = CANONICAL):
         self._fp = fp
+        self.layout = layout
+        self.LINE_LENGTH = layout.rowLength
         self._rolloverMask = 2 ** numAddressBits
         self._nibbles = numAddressBits >> 2
         self._addressMask = "%0{0:d}x ".format(self._nibbles)
+        if layout.ascii:
+            self._rowTemplate = "%0{0:d}x  %s  |%s|\n".format(self._nibbles)
+        else:
+            self._rowTemplate = "%0{0:d}x  %s\n".format(self._nibbles)
+        self._groupStride = 2 * layout.wordSize + 1   # Characters per word, including separator.
+        self.reset()
+
+    def reset(self):
+        """Forget the previous row, i.e. start elision afresh.
+        """
         self.previousRow = bytes()  # bytearray()
         self.elided = False
 
     def dumpData(self, section, offset = 0):
-        end = section.length
-        lineCount = math.ceil(len(section.data) / self.LINE_LENGTH)
-        startPos = 0
-        lineNum = 0
-        endPos = self.LINE_LENGTH
-        while endPos < end:
-            lineNum += 1
-            row = section.data[startPos : endPos]
-            if row == self.previousRow:
-                if not self.elided:
-                    print("          *", file = self._fp)
-                    self.elided = True
-            else:
-                self.dumpRow(row, startPos + section.address)
-                self.elided = False
-            startPos = endPos
-            endPos = endPos + self.LINE_LENGTH
-            self.previousRow = row
-        row = section.data[startPos : endPos]
-        self.dumpRow(row, startPos + section.address)
+        """Full rows (all but the last one) are rendered block-wise by `formatRows()`,
+        one write per block.
+        """
+        rowLength = self.LINE_LENGTH
+        data = dataView(section.data)
+        lastStart = max((section.length - 1) // rowLength * rowLength, 0)  # The last row is never elided.
+        self.dumpBlocks(data[ : lastStart], section.address)
+        self.dumpRow(data[lastStart : lastStart + rowLength], lastStart + section.address)
+        self.dumpTrailer(section.length)
+
+    def dumpBlocks(self, data, address):
+        """Dump `data`, which must consist of full rows only.
+        """
+        blockSize = self.LINE_LENGTH * BLOCK_ROWS
+        for start in range(0, len(data), blockSize):
+            self._fp.write(self.formatRows(data[start : start + blockSize], address + start))
+
+    def dumpTrailer(self, length):
         print("-" * 15, file = self._fp)
-        print("{0:-9d} bytes".format(section.length), file = self._fp)
+        print("{0:-9d} bytes".format(length), file = self._fp)
         print("-" * 15, file = self._fp)
 
+    def dumpRow(self, row, startAddr):
+        self._fp.write(self.formatRow(row, startAddr))
+
+    def hexDigits(self, data):
+        layout = self.layout
+        if layout.swapped:
+            data = swapWords(data, layout.wordSize)
+        return hexlify(data, layout.wordSize)
+
+    def formatRow(self, row, address):
+        """A single, possibly short, row.
+        """
+        layout = self.layout
+        digits = self.hexDigits(row).ljust(layout.hexWidth)
+        address %= self._rolloverMask
+        if layout.ascii:
+            text = bytes(row).translate(ASCII_TABLE).decode("ascii").ljust(layout.rowLength)
+            return self._rowTemplate % (address, digits, text)
+        return self._rowTemplate % (address, digits.rstrip())
+
+    def formatRows(self, block, address):
+        """Text of the full rows in `block` (starting at `address`), repeated rows are elided.
+
+        Rows are compared as slices of `block`, which may be a `memoryview`; hex digits
+        and ASCII column are converted for the whole block at once, elided rows included.
+        Only a block repeating the previous row throughout is elided without conversion.
+        """
+        rowLength = self.LINE_LENGTH
+        previous, elided = self.previousRow, self.elided
+        if len(previous) == rowLength and block == previous * (len(block) // rowLength):
+            # Block consists of repetitions of the previous row only (e.g. erased flash).
+            self.elided = True
+            return "" if elided else ELISION
+        layout = self.layout
+        digits = self.hexDigits(block)
+        stride = rowLength // layout.wordSize * self._groupStride    # Hex characters per row.
+        width = stride - 1
+        text = bytes(block).translate(ASCII_TABLE).decode("ascii") if layout.ascii else None
+        template = self._rowTemplate
+        mask = self._rolloverMask
+        lines = []
+        for idx, offset in enumerate(range(0, len(block), rowLength)):
+            row = block[offset : offset + rowLength]
+            if row == previous:
+                if not elided:
+                    lines.append(ELISION)
+                    elided = True
+            else:
+                start = idx * stride
+                if text is None:
+                    lines.append(template % ((address + offset) % mask, digits[start : start + width]))
+                else:
+                    lines.append(template % ((address + offset) % mask, digits[start : start + width], text[offset : offset + rowLength]))
+                elided = False
+            previous = row
+        self.previousRow, self.elided = bytes(previous), elided  # Don't keep a view (and so the buffer) alive.
+        return ''.join(lines)
+
 
 class CanonicalDumper(Dumper):
+    """Canonical hex+ASCII display, 16 bytes per row.
+    """
     LINE_LENGTH = 0x10
 
-    def printHexBytes(self, row):
-        row = list(row)
-        filler = list([0x20] * (self.LINE_LENGTH - len(row)))
-        print('|{0}|'.format(('%s' * self.LINE_LENGTH) % unpack(*[isprintable(x) and chr(x) or '.' for x in row + filler] )), file = self._fp)
+    def __init__(self, fp = sys.stdout, numAddressBits = 32):
+        super(CanonicalDumper, self).__init__(fp, numAddressBits, CANONICAL)
 
-    def dumpRow(self, row, startAddr):
-        startPos = 0
-        print(self._addressMask % ((startPos + startAddr) % self._rolloverMask), file = self._fp, end = " "),
-        print('%02x ' * len(row) % unpack(*row), file = self._fp, end = " "),
-        if len(row) == 0:
-            print("", file = self._fp, end = "")
-        if len(row) < self.LINE_LENGTH:
-            spaces = "   " * (self.LINE_LENGTH - len(row))
-            print(spaces, file = self._fp, end = ""),
-        self.printHexBytes(row)
 
+_dumpers = weakref.WeakKeyDictionary()  # Stream -> {(layout, numAddressBits): dumper}.
+
+def getDumper(fp = sys.stdout, layout = CANONICAL, numAddressBits = 32):
+    """Cached `Dumper` for stream `fp` and the given settings; its elision state is reset.
+
+    Cached dumpers only hold a weak proxy of their stream, so entries go away with the stream.
+    """
+    try:
+        dumpers = _dumpers.setdefault(fp, {})
+        stream = weakref.proxy(fp)
+    except TypeError:   # Stream doesn't support weak references.
+        dumpers = {}
+        stream = fp
+    key = (layout, numAddressBits)
+    dumper = dumpers.get(key)
+    if dumper is None:
+        if layout == CANONICAL:
+            dumper = CanonicalDumper(stream, numAddressBits)
+        else:
+            dumper = Dumper(stream, numAddressBits, layout)
+        dumpers[key] = dumper
+    else:
+        dumper.reset()
+    return dumper
+
+
+Window = namedtuple("Window", "address length data")    # Minimal `Section` protocol, for `dumpData()`.
+
+
+def dumpFile(filename, fp = sys.stdout, offset = 0, length = None, address = None, numAddressBits = 32, layout = CANONICAL):
+    """Hexdump of `length` bytes at `offset` of file `filename` (up to the end if `length` is None).
+
+    The file is memory-mapped, so memory usage doesn't depend on its size. Addresses start at
+    `address` (default: `offset`).
+    """
+    size = os.path.getsize(filename)
+    if not 0 <= offset <= size:
+        raise ValueError("Offset 0x{0:x} is outside of '{1}' (size 0x{2:x}).".format(offset, filename, size))
+    end = size if length is None else min(offset + length, size)
+    address = offset if address is None else address
+    dumper = Dumper(fp, numAddressBits, layout)
+    if end == offset:
+        dumper.dumpData(Window(address, 0, b''))
+        return
+    mapping = memoryMap(filename)
+    release = hasattr(mapping, 'madvise') and hasattr(mmap, 'MADV_DONTNEED')
+    if release:
+        mapping.madvise(mmap.MADV_SEQUENTIAL)
+    try:
+        # On Python 2 rows are sliced (i.e. copied) from the mapping itself.
+        view = memoryview(mapping) if sys.version_info.major == 3 else mapping
+        rowLength = dumper.LINE_LENGTH
+        length = end - offset
+        lastStart = max((length - 1) // rowLength * rowLength, 0)
+        # Windows must hold whole rows, or rows after the first window boundary get shifted.
+        window = max(MAP_WINDOW - MAP_WINDOW % rowLength, rowLength)
+        released = 0
+        for start in range(0, lastStart, window):
+            stop = min(start + window, lastStart)
+            dumper.dumpBlocks(view[offset + start : offset + stop], address + start)
+            if release:
+                # Dumped pages aren't needed anymore, keep the resident set small.
+                page = (offset + stop) // mmap.PAGESIZE * mmap.PAGESIZE
+                if page > released:
+                    mapping.madvise(mmap.MADV_DONTNEED, released, page - released)
+                    released = page
+        dumper.dumpRow(view[offset + lastStart : min(offset + lastStart + rowLength, end)], address + lastStart)
+        dumper.dumpTrailer(length)
+    finally:
+        view = None
+        mapping.close()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__version__ = "0.1.0"
+
+__copyright__ = """
+    pyObjUtils - Object file library for Python.
+
+   (C) 2010-2016 by Christoph Schueler <cpu12.gems@googlemail.com>
+
+   All Rights Reserved
+
+  This program is free software; you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation; either version 2 of the License, or
+  (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+
+  You should have received a copy of the GNU General Public License along
+  with this program; if not, write to the Free Software Foundation, Inc.,
+  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+
+##
+##  Canonical hexdumps (as written by `Image.hexdump()`) as codec, i.e. hexdumps can be read back.
+##
+
+import io
+
+from objutils.hexdump import CANONICAL
+from objutils.hexfile import BaseType, isBinaryStream
+from objutils.image import Image
+from objutils.logger import Logger
+from objutils.section import Section
+from objutils.utils import createStringBuffer, PYTHON_VERSION
+
+SECTION_HEADER = "Section #"
+HEX_COLUMN_WIDTH = CANONICAL.hexWidth
+ROW_LENGTH = CANONICAL.rowLength
+
+
+class Reader(BaseType):
+    """Rows are decoded by `bytes.fromhex()` on fixed columns, the width of the address column
+    is taken from the first row.
+    """
+
+    SIGNATURES = (SECTION_HEADER.encode("ascii"), )
+
+    def __init__(self):
+        self.logger = Logger("Reader")
+        self.valid = True
+
+    def probeLine(self, line):
+        line = line.decode("ascii", "replace").rstrip("\r\n")
+        return (line.startswith(SECTION_HEADER) or line.strip("-") == "" or line.strip() == "*"
+            or line.endswith(" bytes") or self.rowAddressWidth(line) is not None)
+
+    @staticmethod
+    def rowAddressWidth(line):
+        width = line.find("  ")
+        if width <= 0 or not line.endswith("|"):
+            return None
+        try:
+            int(line[ : width], 16)
+        except ValueError:
+            return None
+        return width
+
+    def load(self, fp, **kws):
+        self.valid = True
+        sections = []
+        chunks = []
+        start = end = None     # Of the current section.
+        width = None
+        elided = False
+        rolloverMask = None
+        for lineNumber, line in enumerate(fp, 1):
+            if not isinstance(line, str):
+                line = line.decode("ascii")
+            line = line.rstrip("\r\n")
+            if not line or line[0] == '-':
+                continue
+            if width is not None and line[width : width + 2] == "  " and line[-1 : ] == "|":
+                try:
+                    address = int(line[ : width], 16)
+                    row = bytearray.fromhex(line[width + 2 : width + 2 + HEX_COLUMN_WIDTH])
+                except ValueError:
+                    self.warn("Ignoring garbage line #{0:d}".format(lineNumber))
+                    continue
+                if start is None:
+                    start = end = address
+                elif elided:
+                    # Elided rows are repetitions of the preceeding one.
+                    count = ((address - end) % rolloverMask) // ROW_LENGTH
+                    chunks.append(chunks[-1] * count)
+                    end = address
+                    elided = False
+                elif address != end % rolloverMask:
+                    self.error("Line #{0:d}: Expected address 0x{1:x}.".format(lineNumber, end % rolloverMask))
+                chunks.append(row)
+                end += len(row)
+            elif line.strip() == "*":
+                if not chunks:
+                    self.error("Line #{0:d}: Elision without preceeding row.".format(lineNumber))
+                elided = True
+            elif line.endswith(" bytes") or line.startswith(SECTION_HEADER):
+                expectedLength = int(line.split()[0]) if line.endswith(" bytes") else None
+                self.flushSection(sections, start, chunks, expectedLength)
+                start = end = None
+                chunks = []
+                elided = False
+            else:
+                width = self.rowAddressWidth(line)
+                if width is None:
+                    self.warn("Ignoring garbage line #{0:d}".format(lineNumber))
+                    continue
+                rolloverMask = 2 ** (width * 4)
+                start = end = int(line[ : width], 16)
+                chunks.append(bytearray.fromhex(line[width + 2 : width + 2 + HEX_COLUMN_WIDTH]))
+                end += len(chunks[-1])
+        self.flushSection(sections, start, chunks, None)
+        if not sections:
+            self.error("File seems to be invalid.")
+        return Image(sections, {}, self.valid)
+
+    def loads(self, image, **kws):
+        if PYTHON_VERSION.major == 3 and isinstance(image, str):
+            image = image.encode("ascii")
+        return self.load(createStringBuffer(image))
+
+    def flushSection(self, sections, start, chunks, expectedLength):
+        if start is None:
+            return
+        section = Section(start, bytearray().join(chunks), copy = False)
+        if expectedLength is not None and section.length != expectedLength:
+            self.error("Section @0x{0:08x}: {1:d} bytes decoded, trailer says {2:d}.".format(start, section.length, expectedLength))
+        sections.append(section)
+
+
+class Writer(BaseType):
+    """`Image.hexdump()`, i.e. the block-wise canonical dumper.
+    """
+
+    def __init__(self):
+        self.logger = Logger("Writer")
+
+    def dump(self, fp, image, **kws):
+        if isBinaryStream(fp):
+            fp.write(self.dumps(image).encode("ascii"))
+        else:
+            image.hexdump(fp)
+
+    def dumps(self, image, **kws):
+        fp = io.StringIO()
+        image.hexdump(fp)
+        return fp.getvalue()
@@ -25,7 +25,10 @@ __copyright__ = """
   51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 """
 
+import binascii
 from collections import defaultdict, namedtuple
+import io
+import itertools
 import logging
 from functools import partial
 import math
@@ -33,13 +36,18 @@ import os
 import re
 import sys
 
-from objutils.section import Section, joinSections
+from objutils.section import Section, joinSections, iterRows
 from objutils.image import Image
 from operator import itemgetter
 from objutils.pickleif import PickleIF
-from objutils.utils import slicer, createStringBuffer, PYTHON_VERSION
+from objutils.utils import createStringBuffer, PYTHON_VERSION
 from objutils.logger import Logger
 
+try:
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:
+    ProcessPoolExecutor = None
+
 
 '''
 MemoryBlocks
@@ -89,6 +97,9 @@ MAP_CHAR_TO_GROUP={
 
 TYPE_FROM_RECORD=0
 
+MAX_SECTION_LENGTH = 4 * 1024 * 1024    # Default bound of sections generated by `Reader.iter_sections()`.
+_DEFAULT = object()
+
 atoi = partial(int, base = 16)
 
 BYTES = re.compile('([0-9a-zA-Z]{2})')
@@ -147,6 +158,158 @@ class FormatParser(object):
         self.translatedFmt.append((groupNumber, length, expr))
 
 
+MAP_GROUP_TO_ATTRIBUTE = {
+    LENGTH          : 'length',
+    TYPE            : 'type',
+    ADDRESS         : 'address',
+    DATA            : 'chunk',
+    CHECKSUM        : 'checksum',
+    ADDR_CHECKSUM   : 'addrChecksum',
+}
+
+PREFIX_CHARS = re.compile(r"^[0-9a-zA-Z:/;%@!]*$")
+
+DECODER_TEMPLATE = """def decode(line):
+    # {fmt}
+    if not line.startswith({prefix!r}):
+        return False
+    try:
+        raw = bytearray(unhexlify(line[{start:d}:].rstrip()))
+    except (TypeError, ValueError):
+        return None
+    if len(raw) {comparison} {minLength:d}:
+        return None
+    record = Container()
+    record.junk = ''
+{assignments}
+    return record
+"""
+
+
+class FormatCompiler(object):
+    """Translate a `FORMAT_SPEC` entry into a decoder function working on fixed offsets.
+
+    The decoder takes a raw line (bytes) and returns a `Container`, `False` if the
+    record prefix doesn't match or `None` if the line is irregular and needs to be
+    matched by the regex generated by `FormatParser`.
+    Formats which can't be sliced by position (spaces, separators, odd field widths,
+    fixed characters after the prefix, unparsed fields) aren't compiled at all.
+    """
+
+    def __init__(self, fmt, dataSep = None):
+        self.fmt = fmt
+        self.dataSep = dataSep
+
+    def compile(self):
+        if self.dataSep is not None:
+            return None
+        groups = [(ch, len(list(grp))) for ch, grp in itertools.groupby(self.fmt)]
+        prefix = ''
+        while groups and groups[0][0] not in MAP_CHAR_TO_GROUP:
+            ch, length = groups.pop(0)
+            prefix += ch * length
+        if not groups or not PREFIX_CHARS.match(prefix):
+            return None
+        leading, trailing, hasData = [], [], False
+        for ch, length in groups:
+            groupNumber = MAP_CHAR_TO_GROUP.get(ch)
+            if groupNumber not in MAP_GROUP_TO_ATTRIBUTE:
+                return None
+            if groupNumber == DATA:
+                if hasData:
+                    return None
+                hasData = True
+            elif length % 2:
+                return None
+            else:
+                (trailing if hasData else leading).append((groupNumber, length // 2))
+        assignments = []
+        offset = 0
+        for groupNumber, width in leading:
+            assignments.append((groupNumber, self.integer(range(offset, offset + width))))
+            offset += width
+        dataStart = offset
+        offset = -sum(w for _, w in trailing)
+        dataEnd = offset or None
+        for groupNumber, width in trailing:
+            assignments.append((groupNumber, self.integer(range(offset, offset + width))))
+            offset += width
+        if hasData:
+            assignments.append((DATA, "raw[{0!r}:{1!r}]".format(dataStart, dataEnd)))
+        fixedLength = sum(w for _, w in leading + trailing)
+        source = DECODER_TEMPLATE.format(
+            fmt = self.fmt,
+            prefix = prefix.encode('ascii'),
+            start = len(prefix),
+            comparison = '<=' if hasData else '!=',
+            minLength = fixedLength,
+            assignments = '\n'.join("    record.{0} = {1}".format(MAP_GROUP_TO_ATTRIBUTE[g], expr) for g, expr in assignments)
+        )
+        namespace = {'unhexlify': binascii.unhexlify, 'Container': Container}
+        exec(source, namespace)
+        decoder = namespace['decode']
+        decoder.prefix = prefix.encode('ascii')
+        return decoder
+
+    @staticmethod
+    def integer(offsets):
+        """Big-endian integer expression over `raw`.
+        """
+        last = len(offsets) - 1
+        return ' | '.join("raw[{0:d}] << {1:d}".format(o, (last - i) * 8) if i < last else "raw[{0:d}]".format(o)
+            for i, o in enumerate(offsets))
+
+
+def _isInherited(klass, name, base = None):
+    """Test if `name` isn't overridden below `base` (defaults to `Reader`).
+    """
+    base = base or Reader
+    method = getattr(klass, name)
+    baseMethod = base.__dict__[name]
+    return getattr(method, '__func__', method) is getattr(baseMethod, '__func__', baseMethod)
+
+
+def isBinaryStream(fp):
+    """Test if `fp` expects bytes rather than text.
+    """
+    return isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or 'b' in getattr(fp, 'mode', '')
+
+
+def splitLines(data, count):
+    """Offsets of (at most) `count` line aligned pieces of `data`.
+    """
+    offsets = [0]
+    if count < 2:
+        return offsets
+    step = len(data) // count
+    for idx in range(1, count):
+        pos = data.find(b'\n', max(idx * step, offsets[-1])) + 1
+        if pos <= 0 or pos >= len(data):
+            break
+        if pos > offsets[-1]:
+            offsets.append(pos)
+    return offsets
+
+
+def _decodeChunk(readerClass, data, startLine, state):
+    """Worker side of `Reader.readParallel()`.
+    """
+    reader = readerClass()
+    reader.setChunkState(state)
+    sections = []
+    metaRecords = []
+    for item in reader.iterRecords(createStringBuffer(data), startLine):
+        if isinstance(item, MetaRecord):
+            metaRecords.append(item)
+            continue
+        address, chunk = item
+        if sections and address == sections[-1][0] + len(sections[-1][1]):
+            sections[-1][1].extend(chunk)
+        else:
+            sections.append((address, bytearray(chunk)))
+    return sections, metaRecords, reader.valid
+
+
 class Container(object):
     def __init__(self):
         self.processingInstructions = []
@@ -174,23 +337,117 @@ class BaseType(object):
 class Reader(BaseType):
     ALIGMENT = 0  # 2**n
     DATA_SEPARATOR = None
+    PARALLEL_DECODING = False   # Lines may be decoded independently (given the state from `chunkStates()`).
+    PARALLEL_CHUNK_SIZE = 256 * 1024
+    SIGNATURES = () # Possible starts of the first record (bytes), used for probing.
     VALID_CHARS = re.compile(r"^[a-fA-F0-9 :/;,%\n\r!?S]*$") # General case, fits most formats.
 
     def __init__(self):
         self.logger = Logger("Reader")
-        if isinstance(self.FORMAT_SPEC, str):
-            self.formats = [FormatParser(self.FORMAT_SPEC, self.DATA_SEPARATOR).parse()]
-        elif isinstance(self.FORMAT_SPEC, (list, tuple)):
-            self.formats = []
-            for formatType, format in self.FORMAT_SPEC:
-                self.formats.append((formatType, FormatParser(format, self.DATA_SEPARATOR).parse()))
-
-    def load(self, fp, **kws):
-        if PYTHON_VERSION.major == 3:
-            return self.read(fp)#.decode()
+        if self.FORMAT_SPEC is not None:
+            self.formats, self.decoders, self.dispatch = self.compiledFormats()
+        else:
+            # Formats are set up by the derived class.
+            self.decoders = [(formatType, None, format) for formatType, format in self.formats]
+            self.dispatch = None
+
+    @classmethod
+    def compiledFormats(cls):
+        """Regexes, decoders and prefix dispatch for the `FORMAT_SPEC` of this class, compiled only once.
+        """
+        if '_compiledFormats' not in cls.__dict__:
+            if isinstance(cls.FORMAT_SPEC, str):
+                formats = [FormatParser(cls.FORMAT_SPEC, cls.DATA_SEPARATOR).parse()]
+            else:
+                formats = []
+                for formatType, format in cls.FORMAT_SPEC:
+                    formats.append((formatType, FormatParser(format, cls.DATA_SEPARATOR).parse()))
+            decoders = cls.compiledDecoders()
+            decoders = [(formatType, decoders.get(formatType), format) for formatType, format in formats]
+            cls._compiledFormats = (formats, decoders, cls.prefixDispatch(decoders))
+        return cls._compiledFormats
+
+    def resetState(self):
+        """Hook to reset the per-file decoding state, so a reader can be reused for another file.
+        """
+
+    @staticmethod
+    def prefixDispatch(decoders):
+        """Map record prefixes directly to decoders, if all formats are compiled and
+        distinguishable by equal-sized prefixes (e.g. 'S1', 'S9' or ':').
+        """
+        prefixes = set(len(d.prefix) if d else 0 for _, d, _ in decoders)
+        if len(prefixes) != 1 or 0 in prefixes:
+            return None
+        dispatch = dict((d.prefix, (formatType, d, format)) for formatType, d, format in decoders)
+        if len(dispatch) != len(decoders):
+            return None
+        return prefixes.pop(), dispatch
+
+    @classmethod
+    def compiledDecoders(cls):
+        """Fixed-offset decoders for the `FORMAT_SPEC` of this class, compiled only once.
+        """
+        if '_compiledDecoders' not in cls.__dict__:
+            decoders = {}
+            if isinstance(cls.FORMAT_SPEC, (list, tuple)) and _isInherited(cls, 'parseData'):
+                for formatType, format in cls.FORMAT_SPEC:
+                    decoder = FormatCompiler(format, cls.DATA_SEPARATOR).compile()
+                    if decoder:
+                        decoders[formatType] = decoder
+            cls._compiledDecoders = decoders
+        return cls._compiledDecoders
+
+    def load(self, fp, workers = None, **kws):
+        if workers and workers > 1 and self.PARALLEL_DECODING and ProcessPoolExecutor:
+            return self.readParallel(fp, workers)
         else:
             return self.read(fp)
 
+    def readParallel(self, fp, workers):
+        """Split `fp` at line boundaries and decode the pieces in `workers` processes.
+        """
+        data = fp.read()
+        if not isinstance(data, bytes):
+            data = data.encode("utf-8")
+        offsets = splitLines(data, min(workers * 4, len(data) // self.PARALLEL_CHUNK_SIZE))
+        if len(offsets) < 2:
+            return self.read(createStringBuffer(data))
+        states = self.chunkStates(data, offsets)
+        bounds = list(zip(offsets, offsets[1 : ] + [len(data)]))
+        sections = []
+        metaData = defaultdict(list)
+        self.valid = True
+        with ProcessPoolExecutor(max_workers = workers) as executor:
+            futures = [executor.submit(_decodeChunk, self.__class__, data[start : end], data.count(b'\n', 0, start) + 1, state)
+                for (start, end), state in zip(bounds, states)
+            ]
+            for future in futures:
+                chunkSections, metaRecords, valid = future.result()
+                for address, chunk in chunkSections:
+                    # Same coalescing as `iter_sections()` across chunk boundaries.
+                    if sections and address == sections[-1].address + sections[-1].length:
+                        sections[-1].data.extend(chunk)
+                        sections[-1].length += len(chunk)
+                    else:
+                        sections.append(Section(address, chunk, copy = False))
+                for record in metaRecords:
+                    metaData[record.formatType].append(record)
+                self.valid = self.valid and valid
+        if sections:
+            return Image(self.joinSections(sections), metaData, self.valid)
+        else:
+            self.error("File seems to be invalid.")
+            return Image([], valid = False)
+
+    def chunkStates(self, data, offsets):
+        """Reader state at the start of each chunk, for formats where records depend on preceding ones.
+        """
+        return [None] * len(offsets)
+
+    def setChunkState(self, state):
+        pass
+
     def loads(self, image, **kws):
         if PYTHON_VERSION.major == 3:
             return self.load(createStringBuffer(bytes(image, "ascii")))
@@ -199,54 +456,120 @@ class Reader(BaseType):
 
     def read(self, fp):
         sections = []
-        matched = False
-        self.valid = True
         metaData = defaultdict(list)
-        for (lineNumber, line) in enumerate(fp.readlines(), 1):
-            for formatType, format in self.formats:
-                if isinstance(line, bytes):
-                    match = format.match(line.decode())
-                else:
-                    match = format.match(line)
-                if match:
-                    matched = True
-                    container = Container()
-                    container.lineNumber = lineNumber
-                    dict_ = match.groupdict()
-                    if dict_ != {}:
-                        # Handle scalar values.
-                        for key, value in dict_.items():
-                            if key not in ('chunk', 'junk'):
-                                setattr(container, key, atoi(value))
-                            elif key == 'junk':
-                                setattr(container, key, value)
-                        if 'chunk' in dict_:
-                            if self.parseData(container, formatType):
-                                chunk = bytearray(map(atoi, BYTES.findall(dict_['chunk'])))
-                            else:
-                                # don't convert/parse stuff like symbols.
-                                chunk = dict_['chunk']
-                            dict_.pop('chunk')
-                            setattr(container, 'chunk', chunk)
-                        self.checkLine(container, formatType)
-                        # this is to handle esoteric stuff like Intel seg:offs addressing and symbols.
-                        self.specialProcessing(container, formatType)
-                        if self.isDataLine(container, formatType):
-                            # print chunk
-                            sections.append(Section(container.address, container.chunk))
-                        else:
-                            chunk = container.chunk if hasattr(container, 'chunk') else None
-                            address = container.address if hasattr(container, 'address') else None
-                            metaData[formatType].append(MetaRecord(formatType, address, chunk))
-                    break
-            if not matched:
-                self.warn("Ignoring garbage line #{0:d}".format(lineNumber))
+        for item in self.iter_sections(fp, None):
+            if isinstance(item, MetaRecord):
+                metaData[item.formatType].append(item)
+            else:
+                sections.append(item)
         if sections:
-            return Image(joinSections(sections), metaData, self.valid)
+            return Image(self.joinSections(sections), metaData, self.valid)
         else:
             self.error("File seems to be invalid.")
             return Image([], valid = False)
 
+    def joinSections(self, sections):
+        """`joinSections()`, overlapping records are reported as warning.
+        """
+        overlaps = []
+        result = joinSections(sections, overlaps = overlaps)
+        if overlaps:
+            duplicates = sum(1 for overlap in overlaps if overlap.duplicate)
+            self.warn("{0:d} overlapping record(s) ({1:d} duplicate), first at address {2:#x}.".format(
+                len(overlaps), duplicates, overlaps[0].address)
+            )
+        return result
+
+    def iter_sections(self, fp, maxLength = _DEFAULT):
+        """Read `fp` line by line and generate `Section`s and `MetaRecord`s.
+
+        Data records are coalesced as long as they are contiguous in file order,
+        i.e. sections are neither sorted nor joined across the whole file (use `read()`
+        for this). A section is handed out as soon as it reaches `maxLength` bytes
+        (default: `MAX_SECTION_LENGTH`), so memory usage stays bounded even for
+        contiguous images; `None` means unbounded.
+        """
+        if maxLength is _DEFAULT:
+            maxLength = MAX_SECTION_LENGTH
+        self.resetState()
+        section = None
+        for item in self.iterRecords(fp):
+            if isinstance(item, MetaRecord):
+                yield item
+                continue
+            address, chunk = item
+            if section is not None and address == section.address + section.length and \
+                    (maxLength is None or section.length < maxLength):
+                section.data.extend(chunk)
+                section.length += len(chunk)
+            else:
+                if section is not None:
+                    yield section
+                section = Section(address, chunk, copy = False)
+        if section is not None:
+            yield section
+
+    def iterRecords(self, fp, startLine = 1):
+        """Generate `(address, chunk)` tuples for data lines and `MetaRecord`s for all others.
+        """
+        matched = False
+        self.valid = True
+        if self.dispatch:
+            prefixLength, dispatch = self.dispatch
+        for (lineNumber, line) in enumerate(fp, startLine):
+            if not isinstance(line, bytes):
+                line = line.encode("utf-8")
+            decoders = self.decoders
+            if self.dispatch:
+                entry = dispatch.get(line[ : prefixLength])
+                if entry:
+                    decoders = (entry, )
+            for formatType, decoder, format in decoders:
+                container = decoder(line) if decoder else None
+                if container is False:
+                    continue
+                if container is None:
+                    container = self.matchLine(format, formatType, line.decode())
+                    if container is None:
+                        continue
+                matched = True
+                container.lineNumber = lineNumber
+                self.checkLine(container, formatType)
+                # this is to handle esoteric stuff like Intel seg:offs addressing and symbols.
+                self.specialProcessing(container, formatType)
+                if self.isDataLine(container, formatType):
+                    yield container.address, container.chunk
+                else:
+                    chunk = container.chunk if hasattr(container, 'chunk') else None
+                    address = container.address if hasattr(container, 'address') else None
+                    yield MetaRecord(formatType, address, chunk)
+                break
+            if not matched:
+                self.warn("Ignoring garbage line #{0:d}".format(lineNumber))
+
+    def matchLine(self, format, formatType, line):
+        """Regex based decoding, used for formats (or lines) the `FormatCompiler` can't handle.
+        """
+        match = format.match(line)
+        if not match:
+            return None
+        container = Container()
+        dict_ = match.groupdict()
+        # Handle scalar values.
+        for key, value in dict_.items():
+            if key not in ('chunk', 'junk'):
+                setattr(container, key, atoi(value))
+            elif key == 'junk':
+                setattr(container, key, value)
+        if 'chunk' in dict_:
+            if self.parseData(container, formatType):
+                chunk = bytearray(map(atoi, BYTES.findall(dict_['chunk'])))
+            else:
+                # don't convert/parse stuff like symbols.
+                chunk = dict_['chunk']
+            setattr(container, 'chunk', chunk)
+        return container
+
     def _addressSpace(self, value):
         if value < 2**16:
             return SIXTEEN_BITS
@@ -271,7 +594,7 @@ class Reader(BaseType):
         if self.maybeBinaryFile(fp):
             return False
         matched = False
-        for (lineNumber, line) in enumerate(fp.readlines(), 1):
+        for (lineNumber, line) in enumerate(fp, 1):
             for formatType, format in self.formats: # NOTE: Same as in 'read()'!
                 if isinstance(line, bytes):
                     match = format.match(line.decode())
@@ -290,6 +613,26 @@ class Reader(BaseType):
         else:
             return self.probe(createStringBuffer(image))
 
+    def probeLine(self, line):
+        """Test if `line` is a valid record (including checksums), without changing the reader state.
+        """
+        if not isinstance(line, bytes):
+            line = line.encode("utf-8")
+        for formatType, decoder, format in self.decoders:
+            try:
+                container = decoder(line) if decoder else None
+                if container is False:
+                    continue
+                if container is None:
+                    container = self.matchLine(format, formatType, line.decode())
+                    if container is None:
+                        continue
+                self.checkLine(container, formatType)
+            except Exception:
+                return False
+            return True
+        return False
+
     def checkLine(self, line, formatType):
         raise NotImplementedError()
 
@@ -308,40 +651,85 @@ class Reader(BaseType):
 
 class Writer(BaseType):
 
+    WRITE_BUFFER_SIZE = 64 * 1024
+
     def __init__(self):
         self.logger = Logger("Writer")
 
     def dump(self, fp, image, rowLength = 16, **kws):   # TODO: rename to bytesPerRow!
-        fp.write(dumps(image, rowLength))
+        """Write `image` to `fp` while the rows are composed, in chunks of about `WRITE_BUFFER_SIZE` characters.
+        """
+        binary = isBinaryStream(fp)
+        if not _isInherited(self.__class__, 'postProcess', Writer):
+            # Whole-text post-processing, can't stream.
+            data = self.dumps(image, rowLength, **kws)
+            fp.write(data.encode("ascii") if binary else data)
+            return
+        lines = []
+        size = 0
+        separator = ''
+        for line in self.iterLines(image, rowLength, **kws):
+            lines.append(line)
+            size += len(line) + 1
+            if size >= self.WRITE_BUFFER_SIZE:
+                self.writeLines(fp, separator, lines, binary)
+                separator = '\n'
+                lines = []
+                size = 0
+        if lines:
+            self.writeLines(fp, separator, lines, binary)
 
     def dumps(self, image, rowLength = 16, **kws):
-        result = []
-        self.rowLength = rowLength
+        return self.postProcess('\n'.join(self.iterLines(image, rowLength, **kws)))
+
+    def iterLines(self, image, rowLength = 16, **kws):
+        """Generate the header, the rows and the footer of `image` as (post-processed) lines.
 
+        Attributes changed while dumping (keyword parameters, settings derived from `image`)
+        are restored afterwards, so a writer can be reused.
+        """
         if not image.sections:
-            return ''
+            return
 
         if self.calculateAddressBits(image) > self.MAX_ADDRESS_BITS:
             raise AddressRangeToLargeError('could not encode image.')
 
+        state = self.__dict__.copy()
+        try:
+            for line in self._iterLines(image, rowLength, **kws):
+                yield line
+        finally:
+            self.__dict__.clear()
+            self.__dict__.update(state)
+
+    def _iterLines(self, image, rowLength, **kws):
+        self.rowLength = rowLength
         params = self.setParameters(**kws)
 
         self.preProcessing(image)
 
+        postProcessLine = self.postProcessLine
         header = self.composeHeader(image.meta)
         if header:
-            result.append(header)
+            header = postProcessLine(header)
+            if header:
+                yield header
+        composeRow = self.composeRow
         for section in image:
-            address = section.address
-            rows = slicer(section.data, rowLength, lambda x:  [int(y) for y in x])
-            for row in rows:
-                length = len(row)
-                result.append(self.composeRow(address, length, row))
-                address += rowLength
+            for address, row in iterRows(section, rowLength):
+                line = postProcessLine(composeRow(address, len(row), row))
+                if line:
+                    yield line
         footer = self.composeFooter(image.meta)
         if footer:
-            result.append(footer)
-        return self.postProcess('\n'.join(result))
+            footer = postProcessLine(footer)
+            if footer:
+                yield footer
+
+    @staticmethod
+    def writeLines(fp, separator, lines, binary):
+        data = separator + '\n'.join(lines)
+        fp.write(data.encode("ascii") if binary else data)
 
     def calculateAddressBits(self, image):
         lastSegment = sorted(image.sections, key = lambda s: s.address)[-1]
@@ -351,6 +739,11 @@ class Writer(BaseType):
     def postProcess(self, data):
         return data
 
+    def postProcessLine(self, line):
+        """Hook applied to every composed header, row and footer; return `None` to drop the line.
+        """
+        return line
+
     def preProcessing(self, image):
         pass
 
@@ -381,8 +774,12 @@ class Writer(BaseType):
 
     @staticmethod
     def hexBytes(row, spaced = False):
-        spacer = ' ' if spaced else ''
-        return spacer.join(["{0:02X}".format(x) for x in row])
+        if not isinstance(row, (bytes, bytearray, memoryview)):
+            row = bytearray(row)
+        digits = binascii.hexlify(row).decode("ascii").upper()
+        if spaced:
+            return ' '.join([digits[idx : idx + 2] for idx in range(0, len(digits), 2)])
+        return digits
 
 
 class ASCIIHexReader(Reader):
@@ -408,29 +805,39 @@ class ASCIIHexReader(Reader):
         return False
 
     def parseLine(self, line, match):
-        section = Section(self.address, bytearray([int(ch, 16) for ch in filter(lambda x: x, self.SPLITTER.split(line))]))
-        self.sections.append(section)
-        self.address += len(section)
+        chunk = bytearray([int(ch, 16) for ch in filter(lambda x: x, self.SPLITTER.split(line))])
+        self.records.append((self.address, chunk))
+        self.address += len(chunk)
         return True
 
     def read(self, fp):
-        if PYTHON_VERSION.major == 3:
-            lines = fp.read().decode()
-        else:
-            lines = fp.read()
-        self.sections = []
+        return Image(self.joinSections(list(self.iter_sections(fp, None))))
+
+    def probeLine(self, line):
+        if isinstance(line, bytes):
+            line = line.decode("ascii", "replace")
+        line = line.rstrip('\r\n')
+        return any(pattern.match(line) for pattern, _ in self.patterns)
+
+    def iterRecords(self, fp):
+        self.records = []
         self.address = 0
-        breakRequest = False
-        for line in lines.splitlines():
+        for line in fp:
+            if not isinstance(line, str):
+                line = line.decode()
+            line = line.rstrip('\r\n')
+            breakRequest = False
             for pattern, action in self.patterns:
                 match = pattern.match(line)
                 if match:
                     if not action(line, match):
                         breakRequest = True
                     break
+            for record in self.records:
+                yield record
+            del self.records[:]
             if breakRequest:
                 break
-        return Image(joinSections(self.sections))
 
 
 class ASCIIHexWriter(Writer):
@@ -448,10 +855,10 @@ class ASCIIHexWriter(Writer):
         self.previousAddress = (address + length)
         if prependAddress:
             line = "{0}\n{1}".format("{0}{1:04X}".format(
-                self.addressDesignator, address), "{0}".format(self.separator).join(["{0:02X}".format(x) for x in row])
+                self.addressDesignator, address), self.hexBytes(row, spaced = True).replace(' ', self.separator)
             )
         else:
-            line = " ".join(["{0:02X}".format(x) for x in row])
+            line = self.hexBytes(row, spaced = True)
         self.rowCallout(address, length, row)
         return line
 
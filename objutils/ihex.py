@@ -28,6 +28,7 @@ __copyright__ = """
 
 from functools import partial
 import operator
+import re
 import objutils.hexfile as hexfile
 from objutils.checksums import lrc, COMPLEMENT_TWOS
 import objutils.utils as utils
@@ -41,7 +42,11 @@ EXTENDED_LINEAR_ADDRESS     = 4
 START_LINEAR_ADDRESS        = 5
 
 
+EXTENDED_ADDRESS = re.compile(br"^:02[0-9a-zA-Z]{4}0([24])([0-9a-zA-Z]{4})", re.MULTILINE)
+
 class Reader(hexfile.Reader):
+    PARALLEL_DECODING = True
+    SIGNATURES = (b':', )
     FORMAT_SPEC = (
         (hexfile.TYPE_FROM_RECORD, ":LLAAAATTDDCC"),
         )
@@ -50,10 +55,14 @@ class Reader(hexfile.Reader):
         super(Reader,self).__init__()
         self.segmentAddress=0
 
+    def resetState(self):
+        self.segmentAddress = 0
+        self.__dict__.pop('_addressCalculator', None)   # Back to the class default (no extended address).
+
     def checkLine(self, line, formatType):
         if line.length != len(line.chunk):
             raise hexfile.InvalidRecordLengthError("Byte count doesn't match length of actual data.")
-        checksum = checksums.lrc(utils.makeList(line.type, line.length, utils.intToArray(line.address), line.chunk), 8, checksums.COMPLEMENT_TWOS)
+        checksum = checksums.lrc(utils.makeBytes(line.type, line.length, utils.intToArray(line.address), line.chunk), 8, checksums.COMPLEMENT_TWOS)
         if line.checksum != checksum:
             raise hexfile.InvalidRecordChecksumError()
 
@@ -100,6 +109,24 @@ class Reader(hexfile.Reader):
         else:
             self.warn("Invalid record type [{0:u}] at line {1:u}".format(line.type, line.lineNumber))
 
+    def chunkStates(self, data, offsets):
+        # Pre-scan for the extended address records in effect at each chunk boundary.
+        states = []
+        state = None
+        matches = EXTENDED_ADDRESS.finditer(data)
+        match = next(matches, None)
+        for offset in offsets:
+            while match and match.start() < offset:
+                state = (16 if match.group(1) == b'4' else 4, int(match.group(2), 16))
+                match = next(matches, None)
+            states.append(state)
+        return states
+
+    def setChunkState(self, state):
+        if state is not None:
+            shiftBy, segment = state
+            self._addressCalculator = partial(operator.add, segment << shiftBy)
+
     _addressCalculator = utils.identity
 
 
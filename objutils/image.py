@@ -28,12 +28,29 @@ __copyright__ = """
 """
 
 import bisect
+from collections import namedtuple
+import heapq
 import operator
 import sys
 
-from objutils.section import Section, joinSections
+import objutils.hexdump as hexdump
+from objutils.section import Section, Overlap, joinSections
 
-## TODO: diff interface!
+class InvalidAddressError(Exception): pass
+class MergeConflictError(Exception): pass
+
+AddressRange = namedtuple("AddressRange", "address length")
+Diff = namedtuple("Diff", "added removed changed")  # Lists of `AddressRange`s.
+
+DIFF_BLOCK_SIZE = 4096
+
+## Merge policies.
+MERGE_ERROR             = "error"           # Any overlap is an error.
+MERGE_FIRST_WINS        = "first-wins"      # Data of the earlier image is kept.
+MERGE_LAST_WINS         = "last-wins"       # Data of the later image is kept.
+MERGE_IDENTICAL_ONLY    = "identical-only"  # Overlaps must have identical contents.
+
+MERGE_POLICIES = (MERGE_ERROR, MERGE_FIRST_WINS, MERGE_LAST_WINS, MERGE_IDENTICAL_ONLY)
 
 ## Adress-space constants.
 AS_16   = 0
@@ -41,6 +58,31 @@ AS_24   = 1
 AS_32   = 2
 AS_64   = 3
 
+_address = operator.attrgetter('address')
+
+
+class SectionList(list):
+    """List of sections counting its modifications, so `Image` notices a stale index.
+    """
+
+    modifications = 0
+
+    def _modifying(name):
+        method = getattr(list, name)
+
+        def modify(self, *args):
+            self.modifications += 1
+            return method(self, *args)
+        modify.__name__ = name
+        return modify
+
+    for _name in ('__setitem__', '__delitem__', '__setslice__', '__delslice__', '__iadd__', '__imul__',
+            'append', 'extend', 'insert', 'pop', 'remove', 'sort', 'reverse', 'clear'):
+        if hasattr(list, _name):
+            locals()[_name] = _modifying(_name)
+    del _name, _modifying
+
+
 class Image(object):
 
     def __init__(self, sections = None, meta = None, valid = False):
@@ -76,47 +118,618 @@ class Image(object):
     def __ne__(self, other):
         return not (self == other)
 
-    def hexdump(self, fp = sys.stdout):
+    def _getSections(self):
+        return self._sections
+
+    def _setSections(self, sections):
+        self._sections = SectionList(sections)
+        self._index = None
+
+    sections = property(_getSections, _setSections)
+
+    def invalidateIndex(self):
+        """Discard the address index.
+
+        Changes of `sections` and moves of `Section`s are detected, this is only needed if other
+        objects providing the section protocol change their addresses.
+        """
+        self._index = None
+
+    def _getIndex(self):
+        """Sections sorted by address, plus their start addresses for bisection.
+
+        The index is rebuilt if `sections` was modified or any `Section` was moved since it was built,
+        lookups also rebuild it if other section objects bracketing the address have moved; sections
+        are expected to be disjoint (as produced by `joinSections()`).
+        """
+        sections = self.sections
+        version = (sections.modifications, Section.moves)
+        if self._index is None or self._index[2] != version:
+            ordered = sorted(sections, key = _address)
+            self._index = ([section.address for section in ordered], ordered, version)
+        return self._index
+
+    def _sectionIndex(self, address):
+        """Position of the section containing `address` in the ordered sections (or None),
+        plus start addresses and ordered sections.
+        """
+        starts, ordered = self._getIndex()[ : 2]
+        idx = bisect.bisect_right(starts, address) - 1
+        if self._moved(starts, ordered, idx) or self._moved(starts, ordered, idx + 1):
+            self.invalidateIndex()
+            starts, ordered = self._getIndex()[ : 2]
+            idx = bisect.bisect_right(starts, address) - 1
+        if idx >= 0 and address < ordered[idx].address + ordered[idx].length:
+            return idx, starts, ordered
+        return None, starts, ordered
+
+    @staticmethod
+    def _moved(starts, ordered, idx):
+        """True if the section at `idx` of the index (if any) has moved since the index was built.
+        """
+        return 0 <= idx < len(starts) and ordered[idx].address != starts[idx]
+
+    def sectionAt(self, address):
+        """The section containing `address`.
+        """
+        idx, _, ordered = self._sectionIndex(address)
+        if idx is None:
+            raise InvalidAddressError("Address {0:#x} is not mapped.".format(address))
+        return ordered[idx]
+
+    def sectionsInRange(self, address, length):
+        """Sections overlapping the range [`address`, `address` + `length`), in address order.
+        """
+        for _ in range(2):
+            starts, ordered = self._getIndex()[ : 2]
+            first = bisect.bisect_right(starts, address) - 1
+            if first < 0 or ordered[first].address + ordered[first].length <= address:
+                first += 1
+            last = bisect.bisect_left(starts, address + length)
+            result = ordered[first : last]
+            if not self._moved(starts, ordered, last) and \
+                    all(section.address == start for section, start in zip(result, starts[first : last])):
+                break
+            self.invalidateIndex()  # Moved since the index was built.
+        return result
+
+    def _spans(self, address, length):
+        """Generate `(section, offset, size)` pieces covering [`address`, `address` + `length`).
+        """
+        idx, starts, ordered = self._sectionIndex(address)
+        end = address + length
+        while idx is not None and idx < len(ordered) and address < end:
+            section = ordered[idx]
+            if section.address != starts[idx]:  # Moved since the index was built.
+                self.invalidateIndex()
+                idx, starts, ordered = self._sectionIndex(address)
+                continue
+            if not (section.address <= address < section.address + section.length):
+                break   # Gap.
+            size = min(end, section.address + section.length) - address
+            yield section, address - section.address, size
+            address += size
+            idx += 1
+        if address < end:
+            raise InvalidAddressError("Address {0:#x} is not mapped.".format(address))
+
+    def read(self, address, length):
+        """`length` bytes starting at `address`, which may span adjacent sections.
+        """
+        if length == 0:
+            return bytearray()
+        return bytearray().join([section.data[offset : offset + size] for section, offset, size in self._spans(address, length)])
+
+    def write(self, address, data):
+        """Overwrite the bytes starting at `address` with `data`, which may span adjacent sections.
+
+        The range must be completely mapped, sections are neither extended nor created.
+        """
+        if not data:
+            return
+        spans = list(self._spans(address, len(data)))   # Check complete range first.
+        pos = 0
+        for section, offset, size in spans:
+            section.data[offset : offset + size] = data[pos : pos + size]
+            pos += size
+
+    def diff(self, other):
+        """Compare with `other` image.
+
+        Returns a `Diff` of the address ranges only present in `other` (added),
+        only present in this image (removed) and present in both, but with
+        different contents (changed).
+        Common ranges are compared in blocks of `DIFF_BLOCK_SIZE` bytes first, only
+        mismatching blocks are inspected byte by byte.
+        """
+        mine = [(s.address, s.address + s.length, s) for s in self._getIndex()[1]]
+        theirs = [(s.address, s.address + s.length, s) for s in other._getIndex()[1]]
+        changed = []
+        i = j = 0
+        while i < len(mine) and j < len(theirs):
+            startA, endA, sectionA = mine[i]
+            startB, endB, sectionB = theirs[j]
+            start, end = max(startA, startB), min(endA, endB)
+            if start < end:
+                _diffData(changed, start, sectionA.data, start - startA, sectionB.data, start - startB, end - start)
+            if endA <= endB:
+                i += 1
+            else:
+                j += 1
+        return Diff(_subtractRanges(theirs, mine), _subtractRanges(mine, theirs), changed)
+
+    def _derive(self, sections):
+        return Image(sections, self.meta, self.valid)
+
+    def fill(self, value = 0xff, alignment = 1, maxGap = None):
+        """New image with gaps filled with `value`.
+
+        Sections are extended to multiples of `alignment` and joined with their successors,
+        if the gap in between is not larger than `maxGap` (None: fill all gaps).
+        """
+        ranges = []
+        for section in self._getIndex()[1]:
+            start = section.address - section.address % alignment
+            end = -(-(section.address + section.length) // alignment) * alignment
+            if ranges and (start <= ranges[-1][1] or maxGap is None or start - ranges[-1][1] <= maxGap):
+                ranges[-1][1] = max(ranges[-1][1], end)
+                ranges[-1][2].append(section)
+            else:
+                ranges.append([start, end, [section]])
+        sections = []
+        for start, end, members in ranges:
+            data = bytearray([value]) * (end - start)
+            for section in members:
+                offset = section.address - start
+                data[offset : offset + section.length] = section.data
+            sections.append(Section(start, data, copy = False))
+        return self._derive(sections)
+
+    def crop(self, address, length):
+        """New image with the data in [`address`, `address` + `length`) only.
+        """
+        end = address + length
+        sections = []
+        for section in self.sectionsInRange(address, length):
+            start = max(address, section.address) - section.address
+            stop = min(end, section.address + section.length) - section.address
+            sections.append(Section(section.address + start, _block(section.data, start, stop - start), copy = False))
+        return self._derive(sections)
+
+    def relocate(self, offset, address = None, length = None):
+        """New image with the data in [`address`, `address` + `length`) (default: everything) moved by `offset` bytes.
+        """
+        sections = []
+        if address is None:
+            moved = self._getIndex()[1]
+        else:
+            moved = self.crop(address, length).sections
+            sections.extend(self._without(address, length))
+        for section in moved:
+            if section.address + offset < 0:
+                raise InvalidAddressError("Section at {0:#x} can't be relocated by {1:d}.".format(section.address, offset))
+            sections.append(Section(section.address + offset, section.data))
+        overlaps = []
+        sections = joinSections(sections, overlaps = overlaps)
+        if overlaps:
+            raise InvalidAddressError("Relocated data overlaps existing data at {0:#x}.".format(overlaps[0].address))
+        return self._derive(sections)
+
+    def _without(self, address, length):
+        """Sections (or parts of them) outside of [`address`, `address` + `length`).
+        """
+        end = address + length
+        result = []
+        for section in self._getIndex()[1]:
+            if section.address < address:
+                stop = min(section.length, address - section.address)
+                result.append(Section(section.address, _block(section.data, 0, stop), copy = False))
+            if section.address + section.length > end:
+                start = max(0, end - section.address)
+                result.append(Section(section.address + start, _block(section.data, start, section.length - start), copy = False))
+        return result
+
+    def split(self, boundary):
+        """New image with sections split at multiples of `boundary` (e.g. flash sectors).
+        """
+        sections = []
+        for section in self._getIndex()[1]:
+            start = 0
+            while start < section.length:
+                address = section.address + start
+                stop = min(section.length, address - address % boundary + boundary - section.address)
+                sections.append(Section(address, _block(section.data, start, stop - start), copy = False))
+                start = stop
+        return self._derive(sections)
+
+    def hexdump(self, fp = sys.stdout, layout = hexdump.CANONICAL):
         for idx, section in enumerate(self.sections):
             print("\nSection #{0:04d}".format(idx ), file = fp)
             print("-" * 13, file = fp)
-            section.hexdump(fp)
+            section.hexdump(fp, layout)
+
+
+_Piece = namedtuple("_Piece", "start end rank data base")   # `data` starts at address `base`.
+
+
+def merge(images, policy = MERGE_ERROR):
+    """Merge `images` into a new `Image`, overlaps are resolved according to `policy`.
+
+    Sections of all images are swept in address order (a k-way merge), so this takes
+    O(n log k) for n sections in k images. Returns the merged image and a list of
+    `Overlap`s (`duplicate` means identical contents).
+    """
+    if policy not in MERGE_POLICIES:
+        raise ValueError("Invalid merge policy '{0!s}'.".format(policy))
+    images = list(images)
+    streams = [[(s.address, rank, s) for s in image._getIndex()[1]] for rank, image in enumerate(images)]
+    pieces = []
+    overlaps = []
+    for address, rank, section in heapq.merge(*streams):
+        incoming = _Piece(address, address + section.length, rank, section.data, address)
+        if incoming.start == incoming.end:
+            continue
+        k = len(pieces)
+        while k and pieces[k - 1].end > incoming.start:
+            k -= 1
+        if k == len(pieces):
+            pieces.append(incoming)
+        else:
+            covered = pieces[k : ]
+            del pieces[k : ]
+            pieces.extend(_resolve(covered, incoming, policy, overlaps))
+    sections = []
+    start = end = None
+    chunks = []
+    for piece in pieces:
+        if piece.start != end:
+            if chunks:
+                sections.append(Section(start, bytearray().join(chunks), copy = False))
+            start = piece.start
+            chunks = []
+        chunks.append(_block(piece.data, piece.start - piece.base, piece.end - piece.start))
+        end = piece.end
+    if chunks:
+        sections.append(Section(start, bytearray().join(chunks), copy = False))
+    return Image(sections, valid = all(image.valid for image in images)), overlaps
+
+
+def _resolve(covered, incoming, policy, overlaps):
+    """Combine `incoming` with the (disjoint, sorted) `covered` pieces it overlaps.
+    """
+    winners = []
+    for piece in covered:
+        start, end = max(piece.start, incoming.start), min(piece.end, incoming.end)
+        if start >= end:
+            continue
+        duplicate = _block(piece.data, start - piece.base, end - start) == _block(incoming.data, start - incoming.base, end - start)
+        overlaps.append(Overlap(start, end - start, duplicate))
+        if policy == MERGE_ERROR or (policy == MERGE_IDENTICAL_ONLY and not duplicate):
+            raise MergeConflictError("Overlapping data at {0:#x}..{1:#x}.".format(start, end - 1))
+        if policy == MERGE_LAST_WINS and incoming.rank >= piece.rank or \
+                policy == MERGE_FIRST_WINS and incoming.rank < piece.rank:
+            winners.append((start, end))
+    # `incoming` is used where it wins or where nothing else is, `covered` elsewhere.
+    uncovered = _subtractRanges([(incoming.start, incoming.end)], [(p.start, p.end) for p in covered])
+    result = [incoming._replace(start = start, end = end) for start, end in winners]
+    result.extend(incoming._replace(start = r.address, end = r.address + r.length) for r in uncovered)
+    for piece in covered:
+        for r in _subtractRanges([(piece.start, piece.end)], winners):
+            result.append(piece._replace(start = r.address, end = r.address + r.length))
+    result.sort(key = operator.attrgetter('start'))
+    return result
+
+
+def _appendRange(ranges, start, end):
+    """Append [`start`, `end`) to `ranges`, adjacent ranges are merged.
+    """
+    if ranges and ranges[-1].address + ranges[-1].length == start:
+        ranges[-1] = AddressRange(ranges[-1].address, end - ranges[-1].address)
+    else:
+        ranges.append(AddressRange(start, end - start))
+
+
+def _subtractRanges(first, second):
+    """Ranges covered by `first`, but not by `second` (both sorted lists of disjoint `(start, end, ...)`).
+    """
+    result = []
+    j = 0
+    for item in first:
+        start, end = item[0], item[1]
+        while j < len(second) and second[j][1] <= start:
+            j += 1
+        k = j
+        while start < end and k < len(second) and second[k][0] < end:
+            if second[k][0] > start:
+                _appendRange(result, start, second[k][0])
+            start = max(start, second[k][1])
+            k += 1
+        if start < end:
+            _appendRange(result, start, end)
+    return result
+
+
+def _block(data, offset, length):
+    if isinstance(data, (bytes, bytearray)):
+        return data[offset : offset + length]
+    return bytes(memoryview(data)[offset : offset + length])   # memoryview comparison is slow.
+
+
+def _diffData(ranges, address, first, firstOffset, second, secondOffset, length):
+    """Append the ranges where `first` and `second` differ to `ranges`.
+    """
+    for pos in range(0, length, DIFF_BLOCK_SIZE):
+        size = min(DIFF_BLOCK_SIZE, length - pos)
+        blockA = _block(first, firstOffset + pos, size)
+        blockB = _block(second, secondOffset + pos, size)
+        if blockA == blockB:
+            continue
+        start = None
+        for idx, (a, b) in enumerate(zip(bytearray(blockA), bytearray(blockB))):
+            if a != b:
+                if start is None:
+                    start = idx
+            elif start is not None:
+                _appendRange(ranges, address + pos + start, address + pos + idx)
+                start = None
+        if start is not None:
+            _appendRange(ranges, address + pos + start, address + pos + size)
+
+
+PAGE_SIZE = 4096
+
+class PagedImage(Image):
+    """Sparse memory, stored as fixed-size pages plus a bitmap of the present bytes per page.
+
+    Writes are cheap (and may happen anywhere), `sections` are created on demand
+    from the runs of present bytes, so the writers work unchanged.
+    """
+
+    def __init__(self, sections = None, meta = None, valid = False, pageSize = PAGE_SIZE):
+        if meta is None:
+            meta = {}
+        self.pageSize = pageSize
+        self._pages = {}    # Page number -> bytearray.
+        self._present = {}  # Page number -> bitmap (int, bit n == byte n of page).
+        self._sections = None
+        self._index = None
+        self.meta = meta
+        self.valid = valid
+        if sections:
+            _validateSections(sections)
+            for section in sections:
+                self.write(section.address, section.data)
+
+    def _getSections(self):
+        if self._sections is None:
+            sections = []
+            start = end = None
+            chunks = []
+            for number in sorted(self._present):
+                page = self._pages[number]
+                base = number * self.pageSize
+                for offset, length in _bitRuns(self._present[number]):
+                    address = base + offset
+                    if address != end:
+                        if chunks:
+                            sections.append(Section(start, bytearray().join(chunks), copy = False))
+                        start = address
+                        chunks = []
+                    chunks.append(page[offset : offset + length])
+                    end = address + length
+            if chunks:
+                sections.append(Section(start, bytearray().join(chunks), copy = False))
+            self._sections = SectionList(sections)
+        return self._sections
+
+    def _pageSlices(self, address, length):
+        """Generate `(page number, offset, size)` covering [`address`, `address` + `length`).
+        """
+        end = address + length
+        while address < end:
+            number, offset = divmod(address, self.pageSize)
+            size = min(self.pageSize - offset, end - address)
+            yield number, offset, size
+            address += size
+
+    def write(self, address, data):
+        """Store `data` at `address`, pages are allocated as needed.
+        """
+        pos = 0
+        for number, offset, size in self._pageSlices(address, len(data)):
+            page = self._pages.get(number)
+            if page is None:
+                page = self._pages[number] = bytearray(self.pageSize)
+                self._present[number] = 0
+            page[offset : offset + size] = data[pos : pos + size]
+            self._present[number] |= ((1 << size) - 1) << offset
+            pos += size
+        self._sections = None
+        self._index = None
+
+    def read(self, address, length):
+        result = bytearray()
+        for number, offset, size in self._pageSlices(address, length):
+            bits = ((1 << size) - 1) << offset
+            if self._present.get(number, 0) & bits != bits:
+                raise InvalidAddressError("Range {0:#x}..{1:#x} is not completely mapped.".format(address, address + length - 1))
+            result.extend(self._pages[number][offset : offset + size])
+        return result
+
+    def isPresent(self, address):
+        number, offset = divmod(address, self.pageSize)
+        return bool(self._present.get(number, 0) & (1 << offset))
+
+    @property
+    def pageCount(self):
+        return len(self._pages)
+
+    sections = property(_getSections)
+
+
+def _bitRuns(bitmap):
+    """Generate `(offset, length)` for every run of set bits in `bitmap`.
+    """
+    offset = 0
+    while bitmap:
+        zeros = (bitmap & -bitmap).bit_length() - 1
+        bitmap >>= zeros
+        offset += zeros
+        inverted = ~bitmap
+        ones = (inverted & -inverted).bit_length() - 1
+        yield offset, ones
+        bitmap >>= ones
+        offset += ones
 
 
 class Builder(object):
     """Construct and `Image` object.
+
+    With `autoSort` the sections are kept ordered by address, `autoJoin` merges a new
+    segment with its contiguous neighbours only. Segments arriving out of order are
+    buffered and merged in a single pass when the sections are needed.
+    Every section a new segment overlaps is recorded in `overlaps` when it is added.
+    Initial `sections` are added like segments (the list itself is not modified).
     """
 
     def __init__(self, sections = None, autoJoin = False, autoSort = False):
-        self._sections = sections if sections else []
-        _validateSections(self._sections)
+        sections = sections if sections else []
+        _validateSections(sections)
+        self._sections = []
+        self._pending = []  # Out of order segments, see `_merge()`.
+        self._overlaps = []
+        self._present = {}  # Page number -> bitmap of the bytes covered by segments, see `_cover()`.
+        self._owners = {}   # Page number -> sections touching the page, rebuilt if None.
         self.address = 0
         self.autoJoin = autoJoin
         self.autoSort = autoSort
+        for section in sections:
+            if self.autoJoin:
+                section = Section(section.address, section.data)    # Joining extends sections in place.
+            self._add(section)
 
     def addSegment(self, data, address = None, dontJoin = False):   # TODO: 'polymorph' signature, move 'dontJoin' to segment!
         address = address if address else self.address  # If Address omitted, create continuous address space.
         if isinstance(data, str):
             data = [ord(x) for x in data] # array.array('B',data)
-        if self.autoSort:
-            bisect.insort(self._sections, Section(address, data))
-        else:
-            self._sections.append(Section(address, data))
-        if self.autoJoin:
-            self.joinSections()
+        self._add(Section(address, data))
         self.address = address + len(data)
 
+    def _add(self, section):
+        if self._cover(section):
+            self._recordOverlaps(section)
+        if self.autoSort and self._sections and section.address < self._sections[-1].address:
+            self._pending.append(section)
+            self._own(section, section)
+        else:
+            self._append(section)
+
+    def _append(self, section):
+        previous = self._sections[-1] if self._sections else None
+        if self.autoJoin and previous is not None and previous.address + previous.length == section.address:
+            self._extend(previous, section)
+            self._own(previous, section)
+        else:
+            self._sections.append(section)
+            self._own(section, section)
+
+    def _merge(self):
+        """Merge the pending segments into the (ordered) sections.
+
+        Only the pending segments are sorted, sections come before pending segments at the
+        same address. For disjoint segments the result is the same as inserting them one by one.
+        """
+        if not self._pending:
+            return
+        self._pending.sort(key = _address)
+        streams = (
+            [(section.address, 0, idx, section) for idx, section in enumerate(self._sections)],
+            [(section.address, 1, idx, section) for idx, section in enumerate(self._pending)],
+        )
+        self._pending = []
+        self._sections = []
+        for _, _, _, section in heapq.merge(*streams):
+            previous = self._sections[-1] if self._sections else None
+            if self.autoJoin and previous is not None and previous.address + previous.length == section.address:
+                self._extend(previous, section)
+                self._owners = None     # `section` is gone.
+            else:
+                self._sections.append(section)
+
+    def _pageNumbers(self, section):
+        return range(section.address // PAGE_SIZE, (section.address + section.length - 1) // PAGE_SIZE + 1)
+
+    def _cover(self, section):
+        """Mark the bytes of `section` as covered, True if any of them was covered already.
+        """
+        overlapping = False
+        address = section.address
+        end = address + section.length
+        while address < end:
+            number, offset = divmod(address, PAGE_SIZE)
+            size = min(PAGE_SIZE - offset, end - address)
+            bits = ((1 << size) - 1) << offset
+            present = self._present.get(number, 0)
+            if present & bits:
+                overlapping = True
+            self._present[number] = present | bits
+            address += size
+        return overlapping
+
+    def _own(self, owner, section):
+        """Register `owner` for the pages of `section` (which is `owner` or was joined into it).
+        """
+        if self._owners is None:
+            return
+        for number in self._pageNumbers(section):
+            owners = self._owners.setdefault(number, [])
+            if not owners or owners[-1] is not owner:
+                owners.append(owner)
+
+    def _recordOverlaps(self, section):
+        """Record an `Overlap` for every section `section` overlaps, by address.
+        """
+        if self._owners is None:
+            self._owners = {}
+            for other in self._sections + self._pending:
+                self._own(other, other)
+        found = {}
+        for number in self._pageNumbers(section):
+            for other in self._owners.get(number, ()):
+                found[id(other)] = other
+        for other in sorted(found.values(), key = _address):
+            self._checkOverlap(other, section)
+
+    def _checkOverlap(self, first, second):
+        start = max(first.address, second.address)
+        end = min(first.address + first.length, second.address + second.length)
+        if start < end:
+            duplicate = first.address == second.address and first.data == second.data
+            self._overlaps.append(Overlap(start, end - start, duplicate))
+
+    @staticmethod
+    def _extend(section, other):
+        section.data.extend(other.data)
+        section.length += other.length
+
     def addMetaData(self, metaData):
         pass
 
     def joinSections(self, orderSegments = None):
+        self._merge()
         self._sections = joinSections(self._sections, orderSegments)
+        self._owners = None
+
+    def hexdump(self, fp = sys.stdout, layout = hexdump.CANONICAL):
+        self.image.hexdump(fp, layout)
 
-    def hexdump(self, fp = sys.stdout):
-        self.image.hexdump(fp)
+    @property
+    def overlaps(self):
+        return self._overlaps
 
     @property
     def image(self):
+        self._merge()
         return Image(self._sections)
 
 
@@ -37,6 +37,8 @@ EOF     = 2
 
 class Reader(hexfile.Reader):
 
+    PARALLEL_DECODING = True
+    SIGNATURES = (b';', )
     FORMAT_SPEC = (
         (DATA,  ";LLAAAADDCCCC"),
         (EOF,   ";00")
@@ -46,7 +48,7 @@ class Reader(hexfile.Reader):
         if formatType == DATA:
             if line.length != len(line.chunk):
                 raise hexfile.InvalidRecordLengthError("Byte count doesn't match length of actual data.")
-            checksum = checksums.lrc(utils.makeList(utils.intToArray(line.address), line.length, line.chunk), 16, checksums.COMPLEMENT_NONE)
+            checksum = checksums.lrc(utils.makeBytes(utils.intToArray(line.address), line.length, line.chunk), 16, checksums.COMPLEMENT_NONE)
             if line.checksum != checksum:
                 raise hexfile.InvalidRecordChecksumError()
 
@@ -59,7 +61,7 @@ class Writer(hexfile.Writer):
     MAX_ADDRESS_BITS = 16
 
     def composeRow(self, address, length, row):
-        checksum = checksums.lrc(utils.makeList(utils.intToArray(address), length, row), 16, checksums.COMPLEMENT_NONE)
+        checksum = checksums.lrc(utils.makeBytes(utils.intToArray(address), length, row), 16, checksums.COMPLEMENT_NONE)
         line = ";{0:02X}{1:04X}{2!s}{3:04X}".format(length, address, Writer.hexBytes(row), checksum)
         return line
 
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__version__ = "0.1.0"
+
+__copyright__ = """
+    pyObjUtils - Object file library for Python.
+
+   (C) 2010-2016 by Christoph Schueler <cpu12.gems@googlemail.com>
+
+   All Rights Reserved
+
+  This program is free software; you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation; either version 2 of the License, or
+  (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+
+  You should have received a copy of the GNU General Public License along
+  with this program; if not, write to the Free Software Foundation, Inc.,
+  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+
+##
+##  Objutils image container ("OUI"), a binary interchange format for images:
+##
+##      header | section table | meta records | padding | section data (aligned) ...
+##
+##  All integers are little endian. Section data is never decoded, the reader just
+##  maps the file into memory and hands out `memoryview`s.
+##
+
+from collections import defaultdict
+import os
+import struct
+import zlib
+
+from objutils.hexfile import BaseType, MetaRecord
+from objutils.image import Image
+from objutils.logger import Logger
+from objutils.section import Section
+from objutils.utils import createStringBuffer, memoryMap
+
+MAGIC = b"\x89OUI\r\n\x1a\n"
+VERSION = 1
+
+HEADER = struct.Struct("<8sHHIQQQI4x")  # magic, version, flags, number of sections, table offset, meta offset,
+                                        # meta size, alignment.
+SECTION = struct.Struct("<QQQI4x")      # address, offset, length, CRC-32.
+META = struct.Struct("<iBQI")           # format type, flags, address, length of chunk.
+
+FLAG_VALID      = 0x0001
+
+META_ADDRESS    = 0x01
+META_CHUNK      = 0x02
+META_TEXT       = 0x04  # Chunk is text (UTF-8 encoded).
+META_BYTES      = 0x08  # Chunk is `bytes`.
+META_LIST       = 0x10  # Chunk is a list of integers.
+                        # None of the type flags: chunk is a `bytearray`.
+
+ALIGNMENT = 64      # Default alignment of section data.
+IOV_MAX = 1024      # Buffers per `os.writev()` call.
+
+
+class InvalidContainerError(Exception): pass
+
+
+def _align(value, alignment):
+    return (value + alignment - 1) // alignment * alignment
+
+
+def _encodeChunk(chunk):
+    """Flags and bytes of a meta record `chunk`.
+    """
+    if chunk is None:
+        return 0, b''
+    if isinstance(chunk, bytes):
+        return META_CHUNK | META_BYTES, chunk
+    if isinstance(chunk, bytearray):
+        return META_CHUNK, bytes(chunk)
+    if isinstance(chunk, list):
+        return META_CHUNK | META_LIST, bytes(bytearray(chunk))
+    return META_CHUNK | META_TEXT, chunk.encode("utf-8")
+
+
+def _decodeChunk(flags, data):
+    if not flags & META_CHUNK:
+        return None
+    if flags & META_TEXT:
+        return data.decode("utf-8")
+    if flags & META_BYTES:
+        return bytes(data)
+    if flags & META_LIST:
+        return list(bytearray(data))
+    return bytearray(data)
+
+
+def encodeMeta(meta):
+    result = []
+    for records in meta.values():
+        for record in records:
+            flags, chunk = _encodeChunk(record.chunk)
+            flags |= META_ADDRESS if record.address is not None else 0
+            result.append(META.pack(record.formatType, flags, record.address or 0, len(chunk)))
+            result.append(chunk)
+    return b''.join(result)
+
+
+def decodeMeta(data):
+    meta = defaultdict(list)
+    offset = 0
+    while offset < len(data):
+        formatType, flags, address, length = META.unpack_from(data, offset)
+        offset += META.size
+        chunk = _decodeChunk(flags, data[offset : offset + length])
+        offset += length
+        meta[formatType].append(MetaRecord(formatType, address if flags & META_ADDRESS else None, chunk))
+    return meta
+
+
+def writeBuffers(fp, buffers):
+    """Write `buffers` to `fp`, in a single `os.writev()` pass for real files.
+    """
+    writev = getattr(os, 'writev', None)
+    try:
+        fileno = fp.fileno() if writev else None
+    except (AttributeError, IOError, OSError, ValueError):
+        fileno = None
+    if fileno is None:
+        for buf in buffers:
+            fp.write(buf)
+        return
+    fp.flush()
+    pending = [memoryview(buf) for buf in buffers if len(buf)]
+    idx = 0     # First buffer not (completely) written yet.
+    while idx < len(pending):
+        written = writev(fileno, pending[idx : idx + IOV_MAX])
+        while idx < len(pending) and written >= len(pending[idx]):
+            written -= len(pending[idx])
+            idx += 1
+        if written:
+            pending[idx] = pending[idx][written : ]
+    try:
+        fp.seek(os.lseek(fileno, 0, os.SEEK_CUR))   # Resync the buffered file object.
+    except (IOError, OSError, ValueError):
+        pass
+
+
+class Reader(BaseType):
+
+    SIGNATURES = (MAGIC[ : 4], )    # Probing splits lines, the full magic contains a line break.
+
+    def __init__(self):
+        self.logger = Logger("Reader")
+        self.valid = True
+
+    def probeLine(self, line):
+        return line.startswith(self.SIGNATURES[0])
+
+    def load(self, fp, verify = False, **kws):
+        """Sections of real files are backed by a (copy-on-write) memory mapping of `fp`,
+        `verify` checks the CRCs of all sections.
+        """
+        name = getattr(fp, 'name', None)
+        if isinstance(name, str) and os.path.isfile(name) and os.path.getsize(name) >= HEADER.size:
+            data = memoryMap(name, copyOnWrite = True)
+        else:
+            data = fp.read()
+            if not isinstance(data, bytearray):
+                data = bytearray(data)
+        return self.decode(data, verify)
+
+    def loads(self, image, verify = False, **kws):
+        return self.decode(bytearray(image), verify)
+
+    def decode(self, buffer, verify = False):
+        view = memoryview(buffer)
+        if len(view) < HEADER.size:
+            raise InvalidContainerError("Truncated container.")
+        magic, version, flags, count, tableOffset, metaOffset, metaSize, _ = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise InvalidContainerError("Not an OUI container.")
+        if version != VERSION:
+            raise InvalidContainerError("Unsupported container version {0:d}.".format(version))
+        if tableOffset + count * SECTION.size > len(view) or metaOffset + metaSize > len(view):
+            raise InvalidContainerError("Truncated container.")
+        self.valid = bool(flags & FLAG_VALID)
+        meta = decodeMeta(view[metaOffset : metaOffset + metaSize].tobytes())
+        sections = []
+        for idx in range(count):
+            address, offset, length, crc = SECTION.unpack_from(buffer, tableOffset + idx * SECTION.size)
+            if offset + length > len(view):
+                raise InvalidContainerError("Truncated container.")
+            data = view[offset : offset + length]
+            if verify and zlib.crc32(data) & 0xffffffff != crc:
+                self.error("CRC mismatch in section @0x{0:08x}.".format(address))
+            sections.append(Section(address, data, copy = False))
+        return Image(sections, meta, self.valid)
+
+
+class Writer(BaseType):
+
+    def __init__(self):
+        self.logger = Logger("Writer")
+
+    def dump(self, fp, image, alignment = ALIGNMENT, **kws):
+        writeBuffers(fp, self.buffers(image, alignment))
+
+    def dumps(self, image, alignment = ALIGNMENT, **kws):
+        fp = createStringBuffer()
+        self.dump(fp, image, alignment)
+        return fp.getvalue()
+
+    def buffers(self, image, alignment = ALIGNMENT):
+        """Header, section table, meta records and (padded) section data of `image`.
+        """
+        sections = image.sections
+        meta = encodeMeta(image.meta)
+        tableOffset = HEADER.size
+        metaOffset = tableOffset + len(sections) * SECTION.size
+        offset = _align(metaOffset + len(meta), alignment)
+        table = []
+        data = [b'\x00' * (offset - metaOffset - len(meta))]
+        for section in sections:
+            view = memoryview(section.data)
+            table.append(SECTION.pack(section.address, offset, section.length, zlib.crc32(view) & 0xffffffff))
+            padding = _align(section.length, alignment) - section.length
+            data.append(view)
+            data.append(b'\x00' * padding)
+            offset += section.length + padding
+        flags = FLAG_VALID if image.valid else 0
+        header = HEADER.pack(MAGIC, VERSION, flags, len(sections), tableOffset, metaOffset, len(meta), alignment)
+        return [header, b''.join(table), meta] + data
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+__version__ = "0.1.0"
+
+__copyright__ = """
+    pyObjUtils - Object file library for Python.
+
+   (C) 2010-2016 by Christoph Schueler <cpu12.gems@googlemail.com>
+
+   All Rights Reserved
+
+  This program is free software; you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation; either version 2 of the License, or
+  (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+
+  You should have received a copy of the GNU General Public License along
+  with this program; if not, write to the Free Software Foundation, Inc.,
+  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+##
+##  Format detection from a bounded prefix of the input.
+##
+##  Codecs are first selected by the `SIGNATURES` of their readers (e.g. 'S' or ':'),
+##  then confirmed by decoding the first few lines of the prefix. A signature is only a
+##  weak prefix check, so even a codec that is the only match needs a confirmed line.
+##
+
+from collections import namedtuple
+from operator import attrgetter
+
+PROBE_SIZE      = 4096
+PROBE_LINES     = 4
+
+UNIQUE_SIGNATURE    = 0.9   # Confidence of a codec that is the only one with a matching signature.
+SIGNATURE           = 0.5   # Base confidence for ambiguous signatures, ...
+CONFIRMATION        = 0.5   # ... plus up to this for the fraction of confirmed lines.
+                            # Codecs without signatures are scored by the fraction alone.
+
+Candidate = namedtuple("Candidate", "name confidence")
+
+
+def readHeader(fp, size = PROBE_SIZE):
+    """Read (at most) `size` bytes from the current position, leaving `fp` unchanged if seekable.
+    """
+    try:
+        pos = fp.tell()
+    except (AttributeError, IOError, ValueError):
+        pos = None
+    header = fp.read(size)
+    if pos is not None:
+        fp.seek(pos)
+    if not isinstance(header, bytes):
+        header = header.encode("utf-8")
+    return header
+
+
+def sampleLines(header, complete = False, count = PROBE_LINES):
+    """The first `count` non-empty lines of `header`, a possibly truncated last line is dropped.
+    """
+    lines = header.splitlines(True)
+    if lines and not complete and not lines[-1].endswith(b'\n'):
+        lines.pop()
+    return [line for line in lines if line.strip()][ : count]
+
+
+def candidates(codecs, header, complete = False):
+    """Ranked list of `Candidate`s for `header`.
+
+    `codecs` are (name, codec) pairs as provided by the `Registry`, `complete` means
+    `header` contains the whole input.
+    """
+    lines = sampleLines(header, complete)
+    if not lines:
+        return []
+    first = lines[0]
+    matching, unsigned = [], []
+    for name, codec in codecs:
+        signatures = getattr(codec.Reader, 'SIGNATURES', ())
+        if not signatures:
+            unsigned.append((name, codec))
+        elif any(first.startswith(signature) for signature in signatures):
+            matching.append((name, codec))
+    if len(matching) == 1:
+        name, codec = matching[0]
+        return [Candidate(name, UNIQUE_SIGNATURE)] if confirm(codec, lines) > 0.0 else []
+    if matching:
+        result = [Candidate(name, SIGNATURE + CONFIRMATION * confirm(codec, lines)) for name, codec in matching]
+    else:
+        result = [Candidate(name, confirm(codec, lines)) for name, codec in unsigned]
+    return sorted([c for c in result if c.confidence > 0.0], key = attrgetter('confidence'), reverse = True)
+
+
+def confirm(codec, lines):
+    """Fraction of `lines` the reader of `codec` accepts.
+    """
+    try:
+        reader = codec.Reader()
+    except Exception:
+        return 0.0
+    return sum(1 for line in lines if reader.probeLine(line)) / float(len(lines))
+
+
+def probe(codecs, fp):
+    """Name of the most likely codec or None.
+    """
+    header = readHeader(fp, PROBE_SIZE + 1)
+    ranked = candidates(codecs, header[ : PROBE_SIZE], len(header) <= PROBE_SIZE)
+    if ranked and ranked[0].confidence > SIGNATURE:
+        return ranked[0].name
+    return None
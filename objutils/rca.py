@@ -38,6 +38,8 @@ NULLS = re.compile(r'\0*\s*!M\s*(.*)', re.DOTALL | re.M)
 
 class Reader(hexfile.Reader):
 
+    PARALLEL_DECODING = True
+    SIGNATURES = (b'\x00', )
     #data = re.sub('\0*$', ';\n:0000', NULLS.match(inFile.read()).group(1), 1)  # FIXME!!!
     FORMAT_SPEC = (
         (DATA, "AAAA DD;"),
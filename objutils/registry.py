@@ -26,6 +26,8 @@ __copyright__ = """
 """
 
 from collections import namedtuple, OrderedDict
+import importlib
+import threading
 
 from objutils.utils import SingletonBase
 
@@ -33,14 +35,54 @@ class CodecDoesNotExistError(Exception): pass
 class CodecAlreadyExistError(Exception): pass
 
 Codec = namedtuple("Codec", "Reader Writer description")
+LazyCodec = namedtuple("LazyCodec", "module description")   # Imported on first use.
+
+
+class CodecHandle(object):
+    """Reader and writer of a codec, constructed on first use and then reused
+    (one instance of each per thread).
+    """
+
+    def __init__(self, codec):
+        self.codec = codec
+        self._local = threading.local()
+
+    def _getReader(self):
+        reader = getattr(self._local, 'reader', None)
+        if reader is None:
+            reader = self._local.reader = self.codec.Reader()
+        return reader
+
+    def _getWriter(self):
+        writer = getattr(self._local, 'writer', None)
+        if writer is None:
+            writer = self._local.writer = self.codec.Writer()
+        return writer
+
+    def load(self, *args, **kws):
+        return self.reader.load(*args, **kws)
+
+    def loads(self, *args, **kws):
+        return self.reader.loads(*args, **kws)
+
+    def dump(self, *args, **kws):
+        self.writer.dump(*args, **kws)
+
+    def dumps(self, *args, **kws):
+        return self.writer.dumps(*args, **kws)
+
+    reader = property(_getReader)
+    writer = property(_getWriter)
+
 
 class Registry(SingletonBase):
 
     def __init__(self):
         self._codecs = OrderedDict()
+        self._handles = {}
 
     def __iter__(self):
-        return iter(self._codecs.items())
+        return iter([(name, self.get(name)) for name in self._codecs])
 
     def _getCodecs(self):
         return self._codecs
@@ -52,8 +94,26 @@ class Registry(SingletonBase):
         codec = self.codecs.get(name)
         if not codec:
             raise CodecDoesNotExistError(name)
+        if isinstance(codec, LazyCodec):
+            codec = self._importCodec(name, codec)
+        return codec
+
+    def _importCodec(self, name, lazy):
+        module = importlib.import_module(lazy.module)
+        codec = Codec(module.Reader, module.Writer, lazy.description)
+        module.Reader.codecName = name
+        module.Writer.codecName = name
+        self._codecs[name] = codec
         return codec
 
+    def handle(self, name):
+        """Reusable `CodecHandle` for codec `name`.
+        """
+        handle = self._handles.get(name)
+        if handle is None:
+            handle = self._handles[name] = CodecHandle(self.get(name))
+        return handle
+
     def register(self, name, readerClass, writerClass, description = ''):
         if name in self.codecs:
             raise CodecAlreadyExistError(name)
@@ -61,6 +121,14 @@ class Registry(SingletonBase):
         readerClass.codecName = name
         writerClass.codecName = name
 
+    def registerLazy(self, name, module, description = ''):
+        """Register the `Reader` and `Writer` of `module` (a dotted path), which
+        is imported not before the codec is actually used.
+        """
+        if name in self.codecs:
+            raise CodecAlreadyExistError(name)
+        self._codecs[name] = LazyCodec(module, description)
+
     codecs = property(_getCodecs)
     formats = property(_getFormats)
 
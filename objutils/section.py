@@ -27,29 +27,43 @@ __copyright__ = """
 """
 
 from array import array
-from operator import itemgetter
+from collections import namedtuple
+from operator import attrgetter
 import reprlib
 import objutils.hexdump as hexdump
 from objutils.utils import PYTHON_VERSION
 
 
+_repr = reprlib.Repr()  # Shared by all sections.
+_repr.maxstring = 64
+_repr.maxother = 64
+
+
 class Section(object):
+    """A contiguous block of data.
+
+    `data` is copied into a `bytearray`, except if `copy` is `False` and `data` already
+    is a `bytearray` or `memoryview`, which is then adopted as is.
+    """
+
+    __slots__ = ('_address', 'data', '_length')
+
+    moves = 0   # Count of address changes of all sections, lets `Image` notice stale indices.
 
-    def __init__(self, address = 0, data = None):
-        self.address = address
+    def __init__(self, address = 0, data = None, copy = True):
+        self._address = address
         if data is None:
             self.data = bytearray()
+        elif not copy and isinstance(data, (bytearray, memoryview)):
+            self.data = data
         else:
+            if isinstance(data, array) and data.typecode != 'B':
+                if PYTHON_VERSION.major == 3:
+                    data = array('B', data.tobytes())
+                else:
+                    data = array('B', data.tostring())
             self.data = bytearray(data) # bytearray seems to be the most appropriate canonical representation.
         self._length = len(self.data)
-        if isinstance(data, array) and data.typecode != 'B':
-            if PYTHON_VERSION.major == 3:
-                data = array('B', data.tobytes())
-            else:
-                data = array('B', data.tostring())
-        self.repr = reprlib.Repr()
-        self.repr.maxstring = 64
-        self.repr.maxother = 64
 
     def __getitem__(self, key):
         if key == 0:
@@ -83,12 +97,21 @@ class Section(object):
         return "Section(address = 0X{0:08X}, length = {1:d}, data = {2})".format(
             self.address,
             self.length,
-            self.repr.repr(memoryview(self.data).tobytes())
+            _repr.repr(memoryview(self.data).tobytes())
         )
 
     def __len__(self):
         return self.length
 
+    @property
+    def address(self):
+        return self._address
+
+    @address.setter
+    def address(self, value):
+        self._address = value
+        Section.moves += 1
+
     @property
     def length(self):
         return self._length
@@ -97,28 +120,76 @@ class Section(object):
     def length(self, value):
         self._length = value
 
-    def hexdump(self, fp):
-        dumper = hexdump.CanonicalDumper(fp)  # TODO: cache dumpers.
-        dumper.dumpData(self)
+    def view(self, offset = 0, length = None):
+        """Zero-copy `memoryview` of `length` bytes at `offset` (up to the end if `length` is None).
+        """
+        end = self.length if length is None else offset + length
+        return memoryview(self.data)[offset : end]
 
+    def hexdump(self, fp, layout = hexdump.CANONICAL):
+        hexdump.getDumper(fp, layout).dumpData(self)
 
-def joinSections(sections, orderSections = True):
-    resultSections = []
-    if orderSections:
-        sections.sort(key = itemgetter(0))
-    prevSection = Section()
-    while sections:
-        section = sections.pop(0)
-        if section.address == prevSection.address + prevSection.length and resultSections:
-            lastSegment = resultSections[-1]
-            lastSegment.data.extend(section.data)
-            lastSegment.length += section.length
-        else:
-            # Create a new Segment.
-            resultSections.append(Section(section.address, section.data))
-        prevSection = section
-    if resultSections:
-        return resultSections
-    else:
-        return []
 
+def iterRows(section, rowLength):
+    """Generate `(address, row)` tuples for `section`, `rowLength` bytes each (but the last one).
+
+    Rows are zero-copy `memoryview`s on Python 3 (bytearray slices on Python 2, where
+    memoryviews don't yield integers); objects providing only the `Section` protocol
+    are fine as well.
+    """
+    data = section.data
+    if not isinstance(data, (bytearray, bytes, memoryview, array)):
+        data = bytearray(data)
+    if PYTHON_VERSION.major == 3:
+        data = memoryview(data)
+    elif not isinstance(data, bytearray):
+        data = bytearray(data)
+    address = section.address
+    for offset in range(0, len(data), rowLength):
+        yield address + offset, data[offset : offset + rowLength]
+
+
+Overlap = namedtuple("Overlap", "address length duplicate")   # Reported by `joinSections()`.
+
+
+def joinSections(sections, orderSections = True, overlaps = None):
+    """Coalesce contiguous `sections` into new `Section`s, in a single pass.
+
+    `sections` are consumed (the list is empty afterwards) and, if `orderSections`
+    is set, stable sorted by address first. If `overlaps` is a list, an `Overlap`
+    is appended for every section starting below the end of the preceeding ones;
+    `duplicate` means the section is a repetition of its predecessor.
+    Overlapping sections are not merged.
+    """
+    if orderSections:
+        sections.sort(key = attrgetter('address'))
+    resultSections = []
+    chunks = []
+    start = end = highest = None
+    previous = None
+    for section in sections:
+        address = section.address
+        if overlaps is not None and highest is not None and address < highest:
+            duplicate = address == previous.address and section.data == previous.data
+            overlaps.append(Overlap(address, min(address + section.length, highest) - address, duplicate))
+        if address != end:
+            if chunks:
+                resultSections.append(_joinChunks(start, chunks))
+            chunks = []
+            start = address
+        chunks.append(section.data)
+        end = address + section.length
+        highest = end if highest is None else max(highest, end)
+        previous = section
+    if chunks:
+        resultSections.append(_joinChunks(start, chunks))
+    del sections[:]
+    return resultSections
+
+
+def _joinChunks(address, chunks):
+    """New `Section` from `chunks`, the data is allocated only once.
+    """
+    if len(chunks) == 1:
+        return Section(address, chunks[0])
+    return Section(address, bytearray().join(chunks), copy = False)
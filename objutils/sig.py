@@ -35,6 +35,8 @@ EOF = 2
 
 class Reader(objutils.hexfile.Reader):
 
+    PARALLEL_DECODING = True
+    SIGNATURES = (b':', )
     FORMAT_SPEC = (
         (DATA, ":AAAALLBBDDCC"),
         (EOF, ":00")
@@ -44,7 +46,7 @@ class Reader(objutils.hexfile.Reader):
         if formatType == DATA:
             if line.length != len(line.chunk):
                 raise hexfile.InvalidRecordLengthError("Byte count doesn't match length of actual data.")
-            addressChecksum = checksums.rotatedXOR(utils.makeList(utils.intToArray(line.address), line.length), 8, checksums.ROTATE_LEFT)
+            addressChecksum = checksums.rotatedXOR(utils.makeBytes(utils.intToArray(line.address), line.length), 8, checksums.ROTATE_LEFT)
             if line.addrChecksum != addressChecksum:
                 raise hexfile.InvalidRecordChecksumError()
             dataChecksum = checksums.rotatedXOR(line.chunk, 8, checksums.ROTATE_LEFT)
@@ -59,7 +61,7 @@ class Writer(objutils.hexfile.Writer):
     MAX_ADDRESS_BITS = 16
 
     def composeRow(self, address, length, row):
-        addressChecksum = checksums.rotatedXOR(utils.makeList(utils.intToArray(address), length), 8, checksums.ROTATE_LEFT)
+        addressChecksum = checksums.rotatedXOR(utils.makeBytes(utils.intToArray(address), length), 8, checksums.ROTATE_LEFT)
         dataChecksum = checksums.rotatedXOR(row, 8, checksums.ROTATE_LEFT)
         line = ":{0:04X}{1:02X}{2:02X}{3}{4:02X}".format(address, length, addressChecksum, Writer.hexBytes(row), dataChecksum)
         self.lastAddress = address + length
@@ -28,7 +28,7 @@ __copyright__ = """
 from functools import partial
 import re
 from objutils.checksums import lrc, COMPLEMENT_ONES
-from objutils.utils import makeList
+from objutils.utils import makeBytes
 import objutils.hexfile as hexfile
 import objutils.utils as utils
 
@@ -57,6 +57,8 @@ SYMBOLTABLE = re.compile(r"(^\$\$\s+(?P<modulename>\S*)(?P<symbols>.*?)\$\$)",re
 SYMBOL = re.compile(r'\s+(?P<symbol>.*?)\s+\$(?P<value>.+)',re.MULTILINE|re.DOTALL)
 
 class Reader(hexfile.Reader):
+    PARALLEL_DECODING = True
+    SIGNATURES = (b'S', )
     FORMAT_SPEC = (
         (S0, "S0LLAAAADDCC"),
         (S1, "S1LLAAAADDCC"),
@@ -69,7 +71,7 @@ class Reader(hexfile.Reader):
     )
 
     def load(self, fp, **kws):
-        data = self.read(fp)
+        data = super(Reader, self).load(fp, **kws)
 
 
         ## todo: extract Symbols and wipe them out.
@@ -83,21 +85,17 @@ class Reader(hexfile.Reader):
         return data
 
     def checkLine(self, line, formatType):
-        # todo: Fkt.!!!
-        if formatType in (S0, S1, S5, S9):
-            checkSumOfAddress = ((line.address & 0xff00) >> 8) + (line.address & 0xff)
-        elif formatType in (S2, S8):
-            checkSumOfAddress = ((line.address & 0xff0000) >> 16) + ((line.address & 0xff00) >> 8) + (line.address & 0xff)
-        elif formatType in (S3, S7):
-            checkSumOfAddress = (((line.address & 0xff000000) >> 24)+((line.address & 0xff0000) >> 16) +
-                ((line.address & 0xff00) >>8 )+(line.address & 0xff)
-            )
-        else:
+        if formatType not in BIAS:
             raise TypeError("Invalid format type '{0!s}'.".format(formatType))
+        checkSumOfAddress = 0
+        address = line.address
+        while address:
+            checkSumOfAddress += address & 0xff
+            address >>= 8
         if hasattr(line, 'chunk'):
-            checksum = (~(sum([line.length,checkSumOfAddress]) + sum(line.chunk))) & 0xff
+            checksum = (~(line.length + checkSumOfAddress + sum(line.chunk))) & 0xff
         else:
-            checksum = (~(sum([line.length,checkSumOfAddress]))) & 0xff
+            checksum = (~(line.length + checkSumOfAddress)) & 0xff
         if line.checksum != checksum:
             raise hexfile.InvalidRecordChecksumError()
         line.length -= BIAS[formatType]   # calculate actual data length.
@@ -169,7 +167,7 @@ class Writer(hexfile.Writer):
             data = []
         length += self.offset
         addressBytes = utils.intToArray(address)
-        checksum = self.checksum(makeList(addressBytes, length, data))
+        checksum = self.checksum(makeBytes(addressBytes, length, data))
         mask = "S%u%02X{0!s}%s%02X".format(self.addressMask)
         return mask % (recordType, length, address, Writer.hexBytes(data), checksum)
 
@@ -34,6 +34,8 @@ EOF     = 2
 
 class Reader(hexfile.Reader):
 
+    PARALLEL_DECODING = True
+    SIGNATURES = (b'/', )
     FORMAT_SPEC = (
         (DATA,  "/AAAALLBBDDCC"),
         (EOF,   "/AAAA00BB"),
@@ -44,7 +46,7 @@ class Reader(hexfile.Reader):
             if line.length != len(line.chunk):
                 raise hexfile.InvalidRecordLengthError("Byte count doesn't match length of actual data.")
             addrChecksum = 0
-            addressChecksum = checksums.nibbleSum(utils.makeList(utils.intToArray(line.address), line.length))
+            addressChecksum = checksums.nibbleSum(utils.makeBytes(utils.intToArray(line.address), line.length))
             if line.addrChecksum != addressChecksum:
                 raise hexfile.InvalidRecordChecksumError()
             checksum = checksums.nibbleSum(line.chunk)
@@ -64,7 +66,7 @@ class Writer(hexfile.Writer):
         return "/{0:04X}00{1:02X}".format(self.lastAddress, checksums.nibbleSum(utils.intToArray(self.lastAddress)))
 
     def composeRow(self, address, length, row):
-        addressChecksum = checksums.nibbleSum(utils.makeList(utils.intToArray(address), length))
+        addressChecksum = checksums.nibbleSum(utils.makeBytes(utils.intToArray(address), length))
 
         dataChecksum = checksums.nibbleSum(row)
         line = "/{0:04X}{1:02X}{2:02X}{3!s}{4:02X}".format(address, length, addressChecksum, Writer.hexBytes(row), dataChecksum)
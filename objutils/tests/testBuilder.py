@@ -3,8 +3,9 @@
 
 import io
 import os
+import random
 from objutils import loads, dumps
-from objutils.section import Section
+from objutils.section import Section, Overlap
 from objutils.image import Builder
 from objutils.utils import createStringBuffer, PYTHON_VERSION
 import unittest
@@ -42,6 +43,23 @@ class TestBasicFunctionality(unittest.TestCase):
         builder = Builder([Section(0x1000, range(128))])
 
 
+    def testSectionsAreNotModified(self):
+        sections = [Section(0x1010, range(16)), Section(0x1000, range(16))]
+        builder = Builder(sections, autoSort = True)
+        self.assertEqual([s.address for s in sections], [0x1010, 0x1000])
+        builder.addSegment(range(16), 0x1020)
+        self.assertEqual(len(sections), 2)
+        self.assertEqual([s.address for s in builder.image], [0x1000, 0x1010, 0x1020])
+
+    def testInitialSectionsAreJoined(self):
+        sections = [Section(0x1000, range(16)), Section(0x1010, range(16)), Section(0x1030, range(16))]
+        builder = Builder(sections, autoJoin = True)
+        self.assertEqual([(s.address, s.length) for s in builder.image], [(0x1000, 32), (0x1030, 16)])
+        self.assertEqual([s.length for s in sections], [16, 16, 16])
+        builder = Builder(list(reversed(sections)), autoJoin = True, autoSort = True)
+        builder.addSegment(range(16), 0x1020)
+        self.assertEqual([(s.address, s.length) for s in builder.image], [(0x1000, 64)])
+
     def testFailIfSectionsAreNotIterateble2(self):
         builder = Builder([])
         print(builder.image)
@@ -69,6 +87,86 @@ class TestBuilderParameters(unittest.TestCase):
     def testBuilderCantJoinSegments(self):
         self.assertEqual(self.createImage(autoSort = False, autoJoin = True), [144, 128, 112, 96, 80])
 
+class TestIncrementalJoin(unittest.TestCase):
+
+    def sections(self, builder):
+        return [(s.address, s.length) for s in builder.image]
+
+    def testJoinWithBothNeighbours(self):
+        builder = Builder(autoSort = True, autoJoin = True)
+        builder.addSegment(range(16), 0x100)
+        builder.addSegment(range(16), 0x120)
+        self.assertEqual(self.sections(builder), [(0x100, 16), (0x120, 16)])
+        builder.addSegment(range(16), 0x110)
+        self.assertEqual(self.sections(builder), [(0x100, 48)])
+        self.assertEqual(list(builder.image.sections[0].data), list(range(16)) * 3)
+
+    def testMatchesJoinSections(self):
+        addresses = [0x140, 0x100, 0x130, 0x110, 0x180, 0x120, 0x170]
+        incremental = Builder(autoSort = True, autoJoin = True)
+        batch = Builder(autoSort = True)
+        for address in addresses:
+            incremental.addSegment(range(16), address)
+            batch.addSegment(range(16), address)
+        batch.joinSections(True)
+        self.assertEqual(self.sections(incremental), self.sections(batch))
+        self.assertEqual(self.sections(incremental), [(0x100, 0x50), (0x170, 0x20)])
+
+    def testManySegments(self):
+        builder = Builder(autoSort = True, autoJoin = True)
+        for address in range(0x10000, 0, -4):
+            builder.addSegment(range(4), address)
+        self.assertEqual(self.sections(builder), [(4, 0x10000)])
+
+    def testRandomOrder(self):
+        addresses = list(range(0x1000, 0x1000 + 20000 * 4, 4))
+        random.Random(4711).shuffle(addresses)
+        builder = Builder(autoSort = True, autoJoin = True)
+        for address in addresses:
+            builder.addSegment(bytearray([address & 0xff] * 4), address)
+        self.assertEqual(self.sections(builder), [(0x1000, 20000 * 4)])
+        data = builder.image.sections[0].data
+        self.assertEqual(data[0 : 8], bytearray([0x00] * 4 + [0x04] * 4))
+        builder.addSegment(range(4), 0x800)
+        builder.addSegment(range(4), 0x804)
+        self.assertEqual(self.sections(builder), [(0x800, 8), (0x1000, 20000 * 4)])
+
+    def testOverlapsAreReported(self):
+        builder = Builder(autoSort = True, autoJoin = True)
+        builder.addSegment(range(16), 0x100)
+        builder.addSegment(range(16), 0x108)
+        builder.addSegment(range(16), 0x100)
+        self.assertEqual(builder.overlaps, [Overlap(0x108, 8, False), Overlap(0x100, 16, True), Overlap(0x108, 8, False)])
+
+    def testNoOverlapsInReverseOrder(self):
+        builder = Builder(autoJoin = True)
+        builder.addSegment(range(16), 0x90)
+        builder.addSegment(range(16), 0x80)
+        self.assertEqual(builder.overlaps, [])
+        builder.addSegment(range(16), 0x88)
+        self.assertEqual(builder.overlaps, [Overlap(0x88, 8, False), Overlap(0x90, 8, False)])
+
+    def testSegmentSpanningSeveralSections(self):
+        for autoSort in (False, True):
+            builder = Builder(autoSort = autoSort, autoJoin = True)
+            builder.addSegment(range(16), 0x110)
+            builder.addSegment(range(16), 0x130)
+            builder.addSegment(range(0x40), 0x100)
+            self.assertEqual(builder.overlaps, [Overlap(0x110, 16, False), Overlap(0x130, 16, False)])
+
+    def testOverlapsOfPendingSegments(self):
+        builder = Builder(autoSort = True, autoJoin = True)
+        builder.addSegment(range(16), 0x100)
+        builder.addSegment(range(16), 0x40)
+        builder.addSegment(range(16), 0x50)
+        self.assertEqual(builder.overlaps, [])
+        builder.addSegment(range(16), 0x48)
+        self.assertEqual(builder.overlaps, [Overlap(0x48, 8, False), Overlap(0x50, 8, False)])
+        self.assertEqual(self.sections(builder), [(0x40, 0x10), (0x48, 0x10), (0x50, 0x10), (0x100, 0x10)])
+        builder.addSegment(range(16), 0x40)
+        self.assertEqual(builder.overlaps[2 : ], [Overlap(0x40, 16, True), Overlap(0x48, 8, False)])
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+import zlib
+
+from objutils import checksum
+from objutils.crc import CRC, CRCParameters, CRC32, create, imageChecksum, tables
+from objutils.image import Builder, Image
+from objutils.section import Section
+
+CHECK = b"123456789"
+
+
+class TestCheckValues(unittest.TestCase):
+
+    def testCRCs(self):
+        for name, value in (("CRC-16/CCITT", 0x29b1), ("CRC-16/ARC", 0xbb3d), ("CRC-32", 0xcbf43926), ("CRC-32C", 0xe3069283)):
+            self.assertEqual(create(name).update(CHECK).value, value, name)
+
+    def testOthers(self):
+        self.assertEqual(create("adler-32").update(CHECK).value, 0x091e01de)
+        self.assertEqual(create("fletcher-16").update(b"abcde").value, 0xc8f0)
+        self.assertEqual(create("fletcher-32").update(b"abcde").value, 0xf04fc729)
+
+    def testCustomParameters(self):
+        crc = CRCParameters(64, 0x42f0e1eba9ea3693, False, False, 0, 0)    # CRC-64/ECMA-182.
+        self.assertEqual(create(crc).update(CHECK).value, 0x6c40df5f0b497347)
+        self.assertRaises(ValueError, CRC, CRCParameters(12, 0x80f, False, True, 0, 0))
+        self.assertRaises(ValueError, create, "crc-5")
+
+    def testSlicingMatchesZlib(self):
+        data = bytes(bytearray(range(256))) * 33 + b"tail"
+        crc = CRC(CRC32)
+        crc._zlib, crc._tables, crc._crc = False, tables(CRC32), CRC32.init
+        self.assertEqual(crc.update(data).value, zlib.crc32(data) & 0xffffffff)
+
+    def testIncremental(self):
+        data = bytes(bytearray(range(256))) * 5
+        for name in ("CRC-16/CCITT", "CRC-16/ARC", "CRC-32C", "ADLER-32", "FLETCHER-16", "FLETCHER-32"):
+            for size in (78, 77, 1):
+                crc = create(name)
+                for start in range(0, len(data), size):
+                    crc.update(data[start : start + size])
+                self.assertEqual(crc.value, create(name).update(data).value, (name, size))
+
+
+class TestImageChecksum(unittest.TestCase):
+
+    def setUp(self):
+        builder = Builder()
+        builder.addSegment(b"\x01\x02\x03\x04", 0x1000)
+        builder.addSegment(b"\x05\x06", 0x1008)
+        self.image = builder.image
+
+    def testGapFill(self):
+        flat = b"\x01\x02\x03\x04\xff\xff\xff\xff\x05\x06"
+        self.assertEqual(checksum(self.image), zlib.crc32(flat) & 0xffffffff)
+        self.assertEqual(checksum(self.image, fill = 0), zlib.crc32(flat.replace(b"\xff", b"\x00")) & 0xffffffff)
+        self.assertEqual(checksum(self.image, fill = None), zlib.crc32(b"\x01\x02\x03\x04\x05\x06") & 0xffffffff)
+
+    def testOddSizedPieces(self):
+        image = Image([Section(0, b"abc"), Section(5, b"defg")])
+        self.assertEqual(checksum(image, "FLETCHER-32"), create("fletcher-32").update(b"abc\xff\xffdefg").value)
+        self.assertEqual(checksum(image, "FLETCHER-32"), 0xe5a62d91)
+        self.assertEqual(checksum(image, "FLETCHER-32", fill = None), create("fletcher-32").update(b"abcdefg").value)
+
+    def testRange(self):
+        expected = create("CRC-16/CCITT").update(b"\xff\xff\x01\x02\x03\x04\xff\xff\xff\xff\x05").value
+        self.assertEqual(imageChecksum("CRC-16/CCITT", self.image, 0xffe, 11), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from objutils import load, dumps
+from objutils.cache import ImageCache, ImagePickler, CacheFormatError, KEY_HASH
+from objutils.hexfile import MetaRecord
+from objutils.image import Builder
+from objutils.utils import createStringBuffer
+
+SREC = """S113B000576F77212044696420796F7520726561D8
+S113B0106C6C7920676F207468726F756768206143
+S113B0206C20746861742074726F75626C6520742E
+S10FB0306F207265616420746869733FCE
+S9030000FC"""
+
+
+class TestImagePickler(unittest.TestCase):
+
+    def testRoundTrip(self):
+        builder = Builder()
+        builder.addSegment(range(16), 0x1000)
+        builder.addSegment(b"hello", 0xffff0000)
+        image = builder.image
+        image.meta = {1: [MetaRecord(1, None, bytearray(b"meta"))]}
+        result = ImagePickler().loads(ImagePickler().dumps(image))
+        self.assertEqual([(s.address, bytes(s.data)) for s in result], [(s.address, bytes(s.data)) for s in image])
+        self.assertEqual(dict(result.meta), image.meta)
+
+    def testInvalidData(self):
+        self.assertRaises(CacheFormatError, ImagePickler().loads, b"garbage")
+
+
+class TestImageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cacheDir = os.path.join(self.directory, "cache")
+        self.fileName = os.path.join(self.directory, "test.srec")
+        with open(self.fileName, "w") as fp:
+            fp.write(SREC)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def loadFile(self, cache):
+        with open(self.fileName, "rb") as fp:
+            return load("srec", fp, cache = cache)
+
+    def testHit(self):
+        cache = ImageCache(self.cacheDir)
+        first = self.loadFile(cache)
+        second = self.loadFile(cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertIsInstance(second.sections[0].data, memoryview)
+        self.assertEqual(dumps("srec", second, recordType = 1, startAddress = 0), SREC)
+        self.assertEqual(dict(second.meta), dict(first.meta))
+
+    def testModifiedFileIsReparsed(self):
+        cache = ImageCache(self.cacheDir)
+        self.loadFile(cache)
+        with open(self.fileName, "w") as fp:
+            fp.write(SREC.replace("S10FB0306F207265616420746869733FCE\n", ""))
+        self.assertEqual(self.loadFile(cache).sections[0].length, 0x30)
+        self.assertEqual(cache.misses, 2)
+
+    def testHashKeys(self):
+        cache = ImageCache(self.cacheDir, keyMode = KEY_HASH)
+        for _ in range(2):
+            image = load("srec", createStringBuffer(bytearray(SREC, "ascii")), cache = cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(image.sections[0].length, 0x3c)
+
+    def testInvalidate(self):
+        cache = ImageCache(self.cacheDir)
+        self.loadFile(cache)
+        with open(self.fileName, "rb") as fp:
+            cache.invalidate("srec", fp)
+        self.loadFile(cache)
+        self.loadFile(cache)
+        cache.clear()
+        self.assertEqual(cache.entries(), [])
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def testEviction(self):
+        cache = ImageCache(self.cacheDir, maxSize = 300)
+        for i in range(3):
+            builder = Builder()
+            builder.addSegment(range(100), 0x1000 * (i + 1))
+            fp = createStringBuffer(bytearray(dumps("srec", builder.image), "ascii"))
+            fp.name = os.path.join(self.directory, "image{0:d}".format(i))  # Not a real file, contents are hashed.
+            load("srec", fp, cache = cache)
+        self.assertEqual(len(cache.entries()), 1)
+        self.assertLessEqual(cache.size, 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
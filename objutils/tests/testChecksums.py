@@ -1,7 +1,8 @@
 
 import unittest
 
-from objutils.checksums import nibbleSum, lrc, rotatedXOR, xor
+from objutils.checksums import nibbleSum, lrc, rotatedXOR, xor, rolb, rorb
+from objutils.checksums import lrcRecords, nibbleSumRecords, rotatedXORRecords
 from objutils.checksums import COMPLEMENT_NONE, COMPLEMENT_ONES, COMPLEMENT_TWOS, ROTATE_LEFT, ROTATE_RIGHT
 
 
@@ -123,6 +124,40 @@ class TestRXORs(unittest.TestCase):
         self.assertEqual(rotatedXOR(range(100), 32, ROTATE_RIGHT), 3)
 
 
+class TestBytesInput(unittest.TestCase):
+
+    DATA = bytearray(range(100))
+
+    def testNibbleSum(self):
+        self.assertEqual(nibbleSum(bytes(self.DATA)), 222)
+        self.assertEqual(nibbleSum(memoryview(self.DATA)), 222)
+
+    def testRXORWithCustomRotator(self):
+        self.assertEqual(rotatedXOR(self.DATA, 8, lambda x: rolb(x)), 66)
+        self.assertEqual(rotatedXOR(self.DATA, 8, lambda x: rorb(x)), 3)
+
+
+class TestRecords(unittest.TestCase):
+
+    RECORDS = [bytes(bytearray(range(n, 3 * n))) for n in range(0, 40, 3)]
+
+    def testLRCRecords(self):
+        for width in (8, 16, 32):
+            for comp in (COMPLEMENT_NONE, COMPLEMENT_ONES, COMPLEMENT_TWOS):
+                self.assertEqual(lrcRecords(self.RECORDS, width, comp), [lrc(r, width, comp) for r in self.RECORDS])
+
+    def testNibbleSumRecords(self):
+        self.assertEqual(nibbleSumRecords(self.RECORDS), [nibbleSum(r) for r in self.RECORDS])
+
+    def testRXORRecords(self):
+        for rotator in (ROTATE_LEFT, ROTATE_RIGHT):
+            self.assertEqual(rotatedXORRecords(self.RECORDS, 8, rotator), [rotatedXOR(r, 8, rotator) for r in self.RECORDS])
+
+    def testNoRecords(self):
+        self.assertEqual(lrcRecords([], 8), [])
+        self.assertEqual(rotatedXORRecords([], 8, ROTATE_LEFT), [])
+
+
 if __name__ == '__main__':
     unittest.main()
 
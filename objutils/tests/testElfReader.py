@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import unittest
+
+import objutils.elf as Elf
+import objutils.elf.defs as defs
+
+PATH_TO_TEST_FILES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ELFFiles")
+
+
+def openElf(name):
+    return Elf.Reader(os.path.join(PATH_TO_TEST_FILES, name))
+
+
+class TestLazyReader(unittest.TestCase):
+
+    def testOnlyHeadersAreParsed(self):
+        reader = openElf("testfile8")
+        self.assertNotIn('programHeaders', reader.__dict__)
+        self.assertNotIn('sectionsToSegments', reader.__dict__)
+        for section in reader.sectionHeaders:
+            self.assertNotIn('image', section.__dict__)
+            self.assertNotIn('symbols', section.__dict__)
+            self.assertIsNone(section._name)
+
+    def testSectionsOnDemand(self):
+        reader = openElf("testfile8")
+        text = reader.sectionHeaderByName(b".text")
+        self.assertEqual(text.shName, b".text")
+        self.assertEqual(len(text.image), text.shSize)
+        self.assertIs(text.image, text.image)
+        self.assertIsNone(reader.sectionHeaderByName(b".nonexistent"))
+
+    def testSymbols(self):
+        reader = openElf("testfile8")
+        symtab = reader.sectionHeaderByName(b".symtab")
+        self.assertEqual(len(symtab.symbols), symtab.shSize // defs.ELF32_SYM_TABLE_SIZE)
+        self.assertEqual(symtab.symbols[0].sectionName, "UNDEF")
+        self.assertFalse(hasattr(reader.sectionHeaderByName(b".text"), 'symbols'))
+
+    def testRelocations(self):
+        reader = openElf("testfile8")
+        relocations = reader.sectionHeaderByName(b".rel.text").relocations
+        self.assertEqual(len(relocations), 383)
+        self.assertTrue(all(hasattr(r, 'r_offset') and hasattr(r, 'r_info') for r in relocations))
+        relocations = openElf("penalty_64_gcc.o.elf").sectionHeaderByName(b".rela.text").relocations
+        self.assertTrue(all(hasattr(r, 'r_addend') for r in relocations))
+
+    def testSegmentMapping(self):
+        reader = openElf("exe_simple32.elf")
+        mapping = reader.sectionsToSegments
+        self.assertEqual(list(mapping.keys()), reader.programHeaders)
+        interp = [s.shName for s in mapping[reader.programHeaders[1]]]
+        self.assertEqual(interp, [b".interp"])
+
+
+if __name__ == '__main__':
+    unittest.main()
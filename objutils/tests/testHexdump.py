@@ -5,11 +5,16 @@ import unittest
 
 from objutils import loads, dumps, probes
 from objutils.section import Section
+import objutils.hexdump as hexdump
 from objutils.image import Image, Builder
 from objutils.utils import createStringBuffer, PYTHON_VERSION
 import os
 import io
+import shutil
 import sys
+import tempfile
+import gc
+import weakref
 
 TEST1 = """
 Section #0000
@@ -84,6 +89,20 @@ Section #0000
 ---------------
 """
 
+TEST6 = """
+Section #0000
+-------------
+00001000  00 00 00 00 00 00 00 00 00 00 00 00 00 00 00 00  |................|
+          *
+00001030  7e 7f 80 00 00 00 00 00 00 00 00 00 00 00 00 00  |~\x7f..............|
+00001040  00 00 00 00 00 00 00 00 00 00 00 00 00 00 00 00  |................|
+          *
+00001070  00 00 00 00 00 00 00 00 00 00 00 00 00 00 00 00  |................|
+---------------
+      128 bytes
+---------------
+"""
+
 #builder = Builder()
 #builder.addSegment(range(53), 0x1000)
 #builder.addSegment(range(0), 0x1000)
@@ -149,6 +168,174 @@ class TestHexdumper(BaseTest):
         self.builder.hexdump(self.buf)
         self.assertEqual(self.getBuffer(), TEST5)
 
+    def testElisionAcrossBlocks(self):
+        blockRows = hexdump.BLOCK_ROWS
+        data = bytearray(128)
+        data[0x30 : 0x33] = b"\x7e\x7f\x80"
+        self.builder.addSegment(data, 0x1000)
+        self.builder.joinSections()
+        try:
+            hexdump.BLOCK_ROWS = 2
+            self.builder.hexdump(self.buf)
+        finally:
+            hexdump.BLOCK_ROWS = blockRows
+        self.assertEqual(self.getBuffer(), TEST6)
+
+
+class TestLayouts(unittest.TestCase):
+
+    def dump(self, layout, data = bytearray(range(21)) + bytearray(32), address = 0x1000):
+        buf = io.StringIO()
+        hexdump.getDumper(buf, layout).dumpData(Section(address, data))
+        return buf.getvalue().splitlines()[ : -3]
+
+    def testRowLength(self):
+        self.assertEqual(self.dump(hexdump.Layout(8))[ : 3], [
+            "00001000  00 01 02 03 04 05 06 07  |........|",
+            "00001008  08 09 0a 0b 0c 0d 0e 0f  |........|",
+            "00001010  10 11 12 13 14 00 00 00  |........|",
+        ])
+        self.assertEqual(self.dump(hexdump.Layout(32))[0][ : 42], "00001000  00 01 02 03 04 05 06 07 08 09 0a")
+
+    def testWords(self):
+        self.assertEqual(self.dump(hexdump.Layout(16, 2))[0], "00001000  0100 0302 0504 0706 0908 0b0a 0d0c 0f0e  |................|")
+        self.assertEqual(self.dump(hexdump.Layout(16, 4, "big"))[0], "00001000  00010203 04050607 08090a0b 0c0d0e0f  |................|")
+        self.assertEqual(self.dump(hexdump.Layout(16, 4), bytearray(range(6)))[0], "00001000  03020100 0504                        |......          |")
+
+    def testCompact(self):
+        self.assertEqual(self.dump(hexdump.COMPACT), [
+            "00001000  00 01 02 03 04 05 06 07 08 09 0a 0b 0c 0d 0e 0f",
+            "00001010  10 11 12 13 14 00 00 00 00 00 00 00 00 00 00 00",
+            "00001020  00 00 00 00 00 00 00 00 00 00 00 00 00 00 00 00",
+            "00001030  00 00 00 00 00",
+        ])
+
+    def testElision(self):
+        self.assertEqual(self.dump(hexdump.Layout(8, 4, "big", False), bytearray(40)), [
+            "00001000  00000000 00000000",
+            "          *",
+            "00001020  00000000 00000000",
+        ])
+
+    def testInvalidLayouts(self):
+        self.assertRaises(ValueError, hexdump.Layout, 16, 3)
+        self.assertRaises(ValueError, hexdump.Layout, 6, 4)
+        self.assertRaises(ValueError, hexdump.Layout, 16, 2, "middle")
+
+    def testDumperCache(self):
+        buf = io.StringIO()
+        dumper = hexdump.getDumper(buf)
+        dumper.elided = True
+        self.assertIs(hexdump.getDumper(buf), dumper)
+        self.assertFalse(dumper.elided)
+        self.assertIsNot(hexdump.getDumper(buf, hexdump.COMPACT), dumper)
+        self.assertIsNot(hexdump.getDumper(io.StringIO()), dumper)
+
+    def testReleasedStreamIsDropped(self):
+        buf = io.StringIO()
+        Section(0x1000, range(20)).hexdump(buf)
+        self.assertIn(buf, hexdump._dumpers)
+        ref = weakref.ref(buf)
+        del buf
+        gc.collect()
+        self.assertIsNone(ref())
+        count = len(hexdump._dumpers)
+        for _ in range(10):
+            dumps("hexdump", Image([Section(0x1000, range(20))]))
+        gc.collect()
+        self.assertLessEqual(len(hexdump._dumpers), count)
+
+    def testImageHexdump(self):
+        builder = Builder()
+        builder.addSegment(range(64), 0x1000)
+        builder.addSegment(range(64), 0x2000)
+        buf = io.StringIO()
+        builder.hexdump(buf, hexdump.Layout(32))
+        self.assertEqual(buf.getvalue().count("|\n"), 4)
+
+
+class TestHexdumpCodec(unittest.TestCase):
+
+    def contents(self, image):
+        return [(s.address, bytes(s.data)) for s in image]
+
+    def testReadElided(self):
+        image = loads("hexdump", TEST3)
+        self.assertTrue(image.valid)
+        self.assertEqual(self.contents(image), [(0x1000, bytes(bytearray(range(64)) + bytearray(512) + bytearray(range(64))))])
+
+    def testRoundTrip(self):
+        builder = Builder()
+        builder.addSegment(bytearray(range(53)) + bytearray(100), 0x1000)
+        builder.addSegment(bytearray(b"\xff" * 40), 0x2000)
+        image = builder.image
+        text = dumps("hexdump", image)
+        self.assertTrue(text.startswith("\nSection #0000\n"))
+        self.assertEqual(self.contents(loads("hexdump", text)), self.contents(image))
+        self.assertEqual(probes(text), "hexdump")
+
+    def testSectionWithoutHeader(self):
+        buf = io.StringIO()
+        Section(0x1000, range(53)).hexdump(buf)
+        self.assertEqual(self.contents(loads("hexdump", buf.getvalue())), [(0x1000, bytes(bytearray(range(53))))])
+
+    def testLengthMismatch(self):
+        self.assertFalse(loads("hexdump", TEST4.replace("53 bytes", "54 bytes")).valid)
+
+
+class TestDumpFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.fileName = os.path.join(self.directory, "flash.bin")
+        self.data = bytearray(range(64)) + bytearray(512) + bytearray(range(53))
+        with open(self.fileName, "wb") as fp:
+            fp.write(self.data)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def dumpSection(self, section):
+        buf = io.StringIO()
+        hexdump.CanonicalDumper(buf).dumpData(section)
+        return buf.getvalue()
+
+    def testWholeFile(self):
+        buf = io.StringIO()
+        hexdump.dumpFile(self.fileName, buf)
+        self.assertEqual(buf.getvalue(), self.dumpSection(Section(0, self.data)))
+
+    def testWindow(self):
+        buf = io.StringIO()
+        hexdump.dumpFile(self.fileName, buf, offset = 0x30, length = 0x205, address = 0x1000)
+        self.assertEqual(buf.getvalue(), self.dumpSection(Section(0x1000, self.data[0x30 : 0x235])))
+
+    def testSmallMapWindows(self):
+        mapWindow = hexdump.MAP_WINDOW
+        hexdump.MAP_WINDOW = 32
+        try:
+            buf = io.StringIO()
+            hexdump.dumpFile(self.fileName, buf)
+        finally:
+            hexdump.MAP_WINDOW = mapWindow
+        self.assertEqual(buf.getvalue(), self.dumpSection(Section(0, self.data)))
+
+    def testMapWindowsAndOddRowLength(self):
+        layout = hexdump.Layout(24)
+        mapWindow = hexdump.MAP_WINDOW
+        hexdump.MAP_WINDOW = 64
+        try:
+            buf = io.StringIO()
+            hexdump.dumpFile(self.fileName, buf, layout = layout)
+        finally:
+            hexdump.MAP_WINDOW = mapWindow
+        expected = io.StringIO()
+        hexdump.Dumper(expected, layout = layout).dumpData(Section(0, self.data))
+        self.assertEqual(buf.getvalue(), expected.getvalue())
+
+    def testInvalidOffset(self):
+        self.assertRaises(ValueError, hexdump.dumpFile, self.fileName, io.StringIO(), len(self.data) + 1)
+
 
 def main():
     unittest.main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import io
+
+from objutils import loads, dumps, dump, load_iter, reg
+from objutils.image import Builder
+from objutils.hexfile import FormatCompiler, MetaRecord
+from objutils.utils import createStringBuffer
+import objutils.srec as srec
+import objutils.ihex as ihex
+import objutils.hexfile as hexfile
+from objutils import load
+
+SREC = """S113B000576F77212044696420796F7520726561D8
+S113B0106C6C7920676F207468726F756768206143
+S113B0206C20746861742074726F75626C6520742E
+S10FB0306F207265616420746869733FCE
+S9030000FC"""
+
+
+class TestFormatCompiler(unittest.TestCase):
+
+    def testDecodeFixedOffsets(self):
+        decoder = FormatCompiler("S1LLAAAADDCC").compile()
+        record = decoder(b"S10FB0306F207265616420746869733FCE\n")
+        self.assertEqual(record.length, 0x0f)
+        self.assertEqual(record.address, 0xb030)
+        self.assertEqual(record.chunk, bytearray(b"o read this?"))
+        self.assertEqual(record.checksum, 0xce)
+
+    def testDecodeTrailingFields(self):
+        decoder = FormatCompiler(";LLAAAADDCCCC").compile()
+        record = decoder(b";0310000102030006\r\n")
+        self.assertEqual(record.address, 0x1000)
+        self.assertEqual(record.chunk, bytearray([1, 2, 3]))
+        self.assertEqual(record.checksum, 0x0006)
+
+    def testDecodeWithoutData(self):
+        decoder = FormatCompiler("S9LLAAAACC").compile()
+        record = decoder(b"S9030000FC")
+        self.assertEqual(record.address, 0)
+        self.assertFalse(hasattr(record, 'chunk'))
+
+    def testPrefixMismatch(self):
+        decoder = FormatCompiler("S1LLAAAADDCC").compile()
+        self.assertIs(decoder(b"S9030000FC"), False)
+
+    def testIrregularLineNeedsRegex(self):
+        decoder = FormatCompiler("S1LLAAAADDCC").compile()
+        self.assertIsNone(decoder(b"S10FB0306F20726561642074686973?FCE"))
+
+    def testUncompilableFormats(self):
+        self.assertIsNone(FormatCompiler("AAAA DD;").compile())
+        self.assertIsNone(FormatCompiler("%LL6CCAAAAADD").compile())
+        self.assertIsNone(FormatCompiler("LL AAAA:DD CCCC", " ").compile())
+
+
+class TestDecoding(unittest.TestCase):
+
+    def testLowerCaseRecords(self):
+        lowered = '\n'.join(line[ : 2] + line[2 : ].lower() for line in SREC.splitlines())
+        self.assertEqual(dumps("srec", loads("srec", lowered), recordType = 1, startAddress = 0), SREC)
+
+    def testTrailingGarbageFallsBackToRegex(self):
+        image = loads("srec", SREC.replace("D8\n", "D8 ;comment\n"))
+        self.assertEqual(dumps("srec", image, recordType = 1, startAddress = 0), SREC)
+
+
+class TestIterSections(unittest.TestCase):
+
+    def iterSections(self, codec, text, **kws):
+        return list(load_iter(codec, createStringBuffer(bytearray(text, "ascii")), **kws))
+
+    def sections(self, items):
+        return [(s.address, s.length) for s in items if not isinstance(s, MetaRecord)]
+
+    def testContiguousRecordsAreCoalesced(self):
+        items = self.iterSections("srec", SREC)
+        self.assertEqual(items[0], MetaRecord(srec.S9, 0, None))
+        self.assertEqual(self.sections(items), [(0xb000, 0x3c)])
+
+    def testMaxLength(self):
+        items = self.iterSections("srec", SREC, maxLength = 0x20)
+        self.assertEqual(self.sections(items), [(0xb000, 0x20), (0xb020, 0x1c)])
+
+    def testLengthIsBoundedByDefault(self):
+        builder = Builder()
+        builder.addSegment(bytearray(range(256)) * 4, 0x1000)
+        text = dumps("srec", builder.image)
+        maxLength = hexfile.MAX_SECTION_LENGTH
+        hexfile.MAX_SECTION_LENGTH = 0x100
+        try:
+            items = self.iterSections("srec", text)
+            unbounded = self.iterSections("srec", text, maxLength = None)
+        finally:
+            hexfile.MAX_SECTION_LENGTH = maxLength
+        self.assertEqual(self.sections(items), [(0x1000, 0x100), (0x1100, 0x100), (0x1200, 0x100), (0x1300, 0x100)])
+        self.assertEqual(self.sections(unbounded), [(0x1000, 0x400)])
+
+    def testGapsStartNewSections(self):
+        text = SREC.replace("S113B0106C", "S113B1106C").replace("43\n", "42\n")
+        items = self.iterSections("srec", text)
+        self.assertEqual(self.sections(items), [(0xb000, 0x10), (0xb110, 0x10), (0xb020, 0x1c)])
+
+    def testASCIIHex(self):
+        items = self.iterSections("titxt", "@1000\n01 02 03\n04 05\n@2000\n06\nq\n")
+        self.assertEqual([(s.address, bytes(s.data)) for s in items], [(0x1000, b"\x01\x02\x03\x04\x05"), (0x2000, b"\x06")])
+
+
+class TestStreamingWriter(unittest.TestCase):
+
+    def setUp(self):
+        builder = Builder()
+        builder.addSegment(range(200), 0x1000)
+        builder.addSegment(range(50), 0x2000)
+        self.image = builder.image
+
+    def runDump(self, codec, fp, bufferSize):
+        writer = reg.get(codec).Writer()
+        writer.WRITE_BUFFER_SIZE = bufferSize
+        writer.dump(fp, self.image)
+        return fp.getvalue()
+
+    def testChunkedDumpEqualsDumps(self):
+        for codec in ("srec", "fpc", "titxt", "rca"):
+            expected = dumps(codec, self.image)
+            for bufferSize in (1, 100, 64 * 1024):
+                self.assertEqual(self.runDump(codec, io.StringIO(), bufferSize), expected)
+
+    def testBinaryStream(self):
+        self.assertEqual(self.runDump("srec", createStringBuffer(), 100), bytearray(dumps("srec", self.image), "ascii"))
+
+    def testEmptyImage(self):
+        fp = io.StringIO()
+        dump("srec", fp, Builder().image)
+        self.assertEqual(fp.getvalue(), "")
+
+
+IHEX = """:020000040001F9
+:10000000576F77212044696420796F75207265618C
+:100010006C6C7920676F207468726F7567682061F7
+:020000040002F8
+:100000006C20746861742074726F75626C65207402
+:0C0010006F207265616420746869733FA2
+:020000023000CC
+:10000000576F77212044696420796F75207265618C
+:00000001FF
+"""
+
+
+class TestParallelDecoding(unittest.TestCase):
+
+    def setUp(self):
+        self.chunkSizes = (srec.Reader.PARALLEL_CHUNK_SIZE, ihex.Reader.PARALLEL_CHUNK_SIZE)
+        srec.Reader.PARALLEL_CHUNK_SIZE = ihex.Reader.PARALLEL_CHUNK_SIZE = 16
+
+    def tearDown(self):
+        srec.Reader.PARALLEL_CHUNK_SIZE, ihex.Reader.PARALLEL_CHUNK_SIZE = self.chunkSizes
+
+    def runLoad(self, codec, text):
+        serial = load(codec, createStringBuffer(bytearray(text, "ascii")))
+        parallel = load(codec, createStringBuffer(bytearray(text, "ascii")), workers = 3)
+        self.assertEqual([(s.address, s.data) for s in parallel], [(s.address, s.data) for s in serial])
+        self.assertEqual(dict(parallel.meta), dict(serial.meta))
+        return parallel
+
+    def testSRec(self):
+        image = self.runLoad("srec", SREC)
+        self.assertEqual([(s.address, s.length) for s in image], [(0xb000, 0x3c)])
+
+    def testIHexExtendedAddresses(self):
+        image = self.runLoad("ihex", IHEX)
+        self.assertEqual([(s.address, s.length) for s in image], [(0x10000, 0x20), (0x20000, 0x1c), (0x30000, 0x10)])
+
+
+class TestReuse(unittest.TestCase):
+
+    def testFormatsAreCompiledOnce(self):
+        first, second = srec.Reader(), srec.Reader()
+        self.assertIs(first.formats, second.formats)
+        self.assertIs(first.decoders, second.decoders)
+
+    def testReaderState(self):
+        reader = ihex.Reader()
+        first = reader.loads(IHEX)
+        second = reader.loads(IHEX.split("\n", 4)[-1])    # Without leading extended address records.
+        self.assertEqual([(s.address, s.length) for s in first], [(0x10000, 0x20), (0x20000, 0x1c), (0x30000, 0x10)])
+        self.assertEqual([(s.address, s.length) for s in second], [(0x0000, 0x1c), (0x30000, 0x10)])
+
+    def testWriterParameters(self):
+        writer = srec.Writer()
+        image = loads("srec", SREC)
+        builder = Builder()
+        builder.addSegment(range(16), 0x123456)
+        self.assertEqual(writer.dumps(image, recordType = 1, startAddress = 0), SREC)
+        self.assertTrue(writer.dumps(builder.image).startswith("S214123456"))
+        self.assertTrue(writer.dumps(image).startswith("S113B000"))
+
+    def testASCIIHexWriter(self):
+        image = loads("srec", SREC)
+        self.assertEqual(dumps("titxt", image), dumps("titxt", image))
+
+    def testCodecHandle(self):
+        handle = reg.handle("srec")
+        self.assertIs(handle, reg.handle("srec"))
+        self.assertIs(handle.reader, handle.reader)
+        self.assertEqual(handle.dumps(handle.loads(SREC), recordType = 1, startAddress = 0), SREC)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,9 @@ import sys
 
 from objutils import loads, dumps
 from objutils.section  import Section
-from objutils.image  import Image, Builder
+from objutils.image  import Image, PagedImage, Builder, InvalidAddressError, AddressRange, Diff, MergeConflictError
+from objutils.section import Overlap
+from objutils import merge
 from objutils.utils import PYTHON_VERSION
 
 class BaseTest(unittest.TestCase):
@@ -90,6 +92,278 @@ class TestCreateSections(BaseTest):
     #def testCreateSectionFromUnicodeFails(self):
     #    self.runSectionTestPass('\x00\x01\x02\x03\x04\x05\x06\x07\x08\t\n\x0b\x0c\r\x0e\x0f')
 
+
+class TestAddressIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.image = Image([Section(0x2000, b"ABCD"), Section(0x1000, range(16)), Section(0x1010, b"xyz")])
+
+    def testSectionAt(self):
+        self.assertEqual(self.image.sectionAt(0x1000).address, 0x1000)
+        self.assertEqual(self.image.sectionAt(0x100f).address, 0x1000)
+        self.assertEqual(self.image.sectionAt(0x1012).address, 0x1010)
+        self.assertEqual(self.image.sectionAt(0x2003).address, 0x2000)
+        for address in (0x0fff, 0x1013, 0x2004):
+            self.assertRaises(InvalidAddressError, self.image.sectionAt, address)
+
+    def testRead(self):
+        self.assertEqual(self.image.read(0x1002, 3), bytearray([2, 3, 4]))
+        self.assertEqual(self.image.read(0x2000, 4), bytearray(b"ABCD"))
+        self.assertEqual(self.image.read(0x1000, 0), bytearray())
+
+    def testReadSpanningAdjacentSections(self):
+        self.assertEqual(self.image.read(0x100e, 4), bytearray(b"\x0e\x0fxy"))
+
+    def testReadUnmapped(self):
+        self.assertRaises(InvalidAddressError, self.image.read, 0x1012, 2)
+        self.assertRaises(InvalidAddressError, self.image.read, 0x0ffe, 4)
+        self.assertRaises(InvalidAddressError, self.image.read, 0x1800, 1)
+
+    def testWrite(self):
+        self.image.write(0x100f, b"\xff\xee")
+        self.assertEqual(self.image.read(0x100e, 4), bytearray(b"\x0e\xff\xeey"))
+        self.assertEqual(self.image.sectionAt(0x1010).length, 3)
+
+    def testWriteUnmappedChangesNothing(self):
+        self.assertRaises(InvalidAddressError, self.image.write, 0x1011, b"12345")
+        self.assertEqual(self.image.read(0x1010, 3), bytearray(b"xyz"))
+
+    def testSectionsInRange(self):
+        addresses = lambda address, length: [s.address for s in self.image.sectionsInRange(address, length)]
+        self.assertEqual(addresses(0x1008, 0x10), [0x1000, 0x1010])
+        self.assertEqual(addresses(0x1013, 0x0fed), [])
+        self.assertEqual(addresses(0x1013, 0x0fee), [0x2000])
+        self.assertEqual(addresses(0, 0x10000), [0x1000, 0x1010, 0x2000])
+
+    def testIndexFollowsSections(self):
+        self.image.sections.append(Section(0x3000, b"new"))
+        self.assertEqual(self.image.read(0x3000, 3), bytearray(b"new"))
+
+    def testIndexFollowsReplacedSections(self):
+        first = self.image.sections[0]
+        self.image.read(first.address, 2)
+        self.image.sections[0] = Section(0x3000, b"QRST")
+        self.assertEqual(self.image.read(0x3000, 2), bytearray(b"QR"))
+        self.assertEqual([s.address for s in self.image.sectionsInRange(0x3000, 4)], [0x3000])
+        self.assertRaises(InvalidAddressError, self.image.read, first.address, 2)
+        self.image.sections = [Section(0x4000, b"abc")] + self.image.sections[1 : ]
+        self.assertEqual(self.image.read(0x4000, 3), bytearray(b"abc"))
+        self.image.sections[0].address = 0x5000
+        self.assertEqual(self.image.read(0x5000, 3), bytearray(b"abc"))
+
+    def testWriteToReplacedSection(self):
+        self.assertEqual(self.image.read(0x2000, 4), bytearray(b"ABCD"))
+        self.image.sections[2] = Section(0x2000, b"CCCC")
+        self.assertEqual(self.image.read(0x2000, 4), bytearray(b"CCCC"))
+        self.image.write(0x2000, b"ZZ")
+        self.assertEqual(self.image.sections[2].data, bytearray(b"ZZCC"))
+        self.image.sections[1] = Section(0x9000, b"wxyz")
+        self.assertEqual(self.image.read(0x9000, 4), bytearray(b"wxyz"))
+        self.assertRaises(InvalidAddressError, self.image.read, 0x1010, 1)
+
+    def testSectionMovedFarAwayIsDetected(self):
+        self.assertEqual(self.image.read(0x1000, 1), bytearray(b"\x00"))
+        self.image.sectionAt(0x1000).address = 0x9000
+        self.assertEqual(self.image.read(0x9000, 2), bytearray(b"\x00\x01"))
+        self.assertRaises(InvalidAddressError, self.image.read, 0x1000, 1)
+        self.assertEqual([s.address for s in self.image.sectionsInRange(0, 0x10000)], [0x1010, 0x2000, 0x9000])
+
+    def testMovedSectionIsDetected(self):
+        self.image.read(0x2000, 1)
+        self.image.sectionAt(0x2000).address = 0x2800
+        self.assertRaises(InvalidAddressError, self.image.read, 0x2000, 1)
+        self.assertEqual(self.image.read(0x2800, 1), bytearray(b"A"))
+
+    def testSectionMovedIntoGapIsDetected(self):
+        self.image.read(0x2000, 1)
+        self.image.sectionAt(0x2000).address = 0x1800
+        self.assertEqual(self.image.sectionAt(0x1800).address, 0x1800)
+        self.assertEqual(self.image.read(0x1800, 1), bytearray(b"A"))
+        self.image.sectionAt(0x1800).address = 0x1100
+        self.assertEqual([s.address for s in self.image.sectionsInRange(0x1010, 0x100)], [0x1010, 0x1100])
+
+    def testLookupDoesNotVisitAllSections(self):
+        reads = [0]
+
+        class CountingSection(object):
+
+            def __init__(self, address, data):
+                self._address = address
+                self.data = bytearray(data)
+                self.length = len(data)
+
+            @property
+            def address(self):
+                reads[0] += 1
+                return self._address
+
+        image = Image([CountingSection(address, b"ab") for address in range(0, 40000, 4)])
+        image.read(0, 1)
+        reads[0] = 0
+        for address in range(0, 40000, 400):
+            image.write(address, b"xy")
+            self.assertEqual(image.read(address + 1, 1), bytearray(b"y"))
+            image.sectionAt(address)
+        self.assertTrue(reads[0] < 100 * 20)
+
+
+class TestPagedImage(unittest.TestCase):
+
+    def setUp(self):
+        self.image = PagedImage([Section(0x0ffe, b"abcd"), Section(0x2000, b"xy")])
+
+    def sections(self, image):
+        return [(s.address, bytes(s.data)) for s in image]
+
+    def testSectionsSpanPages(self):
+        self.assertEqual(self.sections(self.image), [(0x0ffe, b"abcd"), (0x2000, b"xy")])
+        self.assertEqual(self.image.pageCount, 3)
+
+    def testRandomWrites(self):
+        self.image.write(0x1002, b"ef")
+        self.image.write(0x1fff, b"w")
+        self.image.write(0x0ffe, b"A")
+        self.assertEqual(self.sections(self.image), [(0x0ffe, b"Abcdef"), (0x1fff, b"wxy")])
+
+    def testRead(self):
+        self.assertEqual(self.image.read(0x0fff, 3), bytearray(b"bcd"))
+        self.assertRaises(InvalidAddressError, self.image.read, 0x1000, 3)
+        self.assertTrue(self.image.isPresent(0x2001))
+        self.assertFalse(self.image.isPresent(0x2002))
+
+    def testSectionAt(self):
+        self.assertEqual(self.image.sectionAt(0x1001).address, 0x0ffe)
+        self.assertRaises(InvalidAddressError, self.image.sectionAt, 0x1002)
+
+    def testIslands(self):
+        image = PagedImage()
+        for address in range(0x80000000, 0x80100000, 0x1000):
+            image.write(address + 0x10, b"\x55" * 8)
+        self.assertEqual(len(image), 256)
+        self.assertEqual(image.pageCount, 256)
+
+    def testWritersWorkUnchanged(self):
+        image = Image([Section(0x0ffe, b"abcd"), Section(0x2000, b"xy")])
+        for codec in ("srec", "titxt", "fpc", "ash"):
+            self.assertEqual(dumps(codec, self.image), dumps(codec, image))
+
+
+class TestDiff(unittest.TestCase):
+
+    def testEqual(self):
+        image = Image([Section(0x1000, range(64))])
+        self.assertEqual(image.diff(Image([Section(0x1000, range(32)), Section(0x1020, range(32, 64))])), Diff([], [], []))
+
+    def testAddedAndRemoved(self):
+        first = Image([Section(0x1000, bytearray(0x100)), Section(0x3000, b"abc")])
+        second = Image([Section(0x1080, bytearray(0x100)), Section(0x4000, b"abc")])
+        diff = first.diff(second)
+        self.assertEqual(diff.added, [AddressRange(0x1100, 0x80), AddressRange(0x4000, 3)])
+        self.assertEqual(diff.removed, [AddressRange(0x1000, 0x80), AddressRange(0x3000, 3)])
+        self.assertEqual(diff.changed, [])
+
+    def testHoleInside(self):
+        first = Image([Section(0x1000, bytearray(0x100))])
+        second = Image([Section(0x1000, bytearray(0x10)), Section(0x1020, bytearray(0x10))])
+        self.assertEqual(first.diff(second).removed, [AddressRange(0x1010, 0x10), AddressRange(0x1030, 0xd0)])
+
+    def testChanged(self):
+        data = bytearray(3 * 4096)
+        changed = bytearray(data)
+        changed[10 : 12] = b"xy"
+        changed[4095 : 4097] = b"zz"    # Across a block boundary.
+        changed[-1] = 1
+        diff = Image([Section(0x10000, data)]).diff(Image([Section(0x10000, changed)]))
+        self.assertEqual(diff.changed, [AddressRange(0x1000a, 2), AddressRange(0x10fff, 2), AddressRange(0x12fff, 1)])
+
+    def testPagedImage(self):
+        first = PagedImage([Section(0x1000, b"abcd")])
+        second = Image([Section(0x1002, b"cX")])
+        self.assertEqual(first.diff(second), Diff([], [AddressRange(0x1000, 2)], [AddressRange(0x1003, 1)]))
+
+
+class TestMerge(unittest.TestCase):
+
+    def setUp(self):
+        self.boot = Image([Section(0x00, b"B" * 16)])
+        self.app = Image([Section(0x08, b"A" * 16), Section(0x40, b"a" * 4)])
+        self.cal = Image([Section(0x10, b"C" * 4), Section(0x3e, b"CCC")])
+
+    def merged(self, images, policy):
+        image, overlaps = merge(images, policy)
+        return [(s.address, bytes(s.data)) for s in image], overlaps
+
+    def testDisjoint(self):
+        sections, overlaps = self.merged([self.app, Image([Section(0x30, b"xy")])], "error")
+        self.assertEqual(sections, [(0x08, b"A" * 16), (0x30, b"xy"), (0x40, b"aaaa")])
+        self.assertEqual(overlaps, [])
+
+    def testFirstWins(self):
+        sections, overlaps = self.merged([self.boot, self.app, self.cal], "first-wins")
+        self.assertEqual(sections, [(0x00, b"B" * 16 + b"A" * 8), (0x3e, b"CCaaaa")])
+        self.assertEqual(overlaps, [Overlap(0x08, 8, False), Overlap(0x10, 4, False), Overlap(0x40, 1, False)])
+
+    def testLastWins(self):
+        sections, _ = self.merged([self.boot, self.app, self.cal], "last-wins")
+        self.assertEqual(sections, [(0x00, b"B" * 8 + b"A" * 8 + b"CCCC" + b"A" * 4), (0x3e, b"CCCaaa")])
+
+    def testError(self):
+        self.assertRaises(MergeConflictError, merge, [self.boot, self.app], "error")
+
+    def testIdenticalOnly(self):
+        sections, overlaps = self.merged([self.boot, Image([Section(0x04, b"BBBB")])], "identical-only")
+        self.assertEqual(sections, [(0x00, b"B" * 16)])
+        self.assertEqual(overlaps, [Overlap(0x04, 4, True)])
+        self.assertRaises(MergeConflictError, merge, [self.boot, self.app], "identical-only")
+
+    def testInvalidPolicy(self):
+        self.assertRaises(ValueError, merge, [self.boot], "random")
+
+    def testManyImages(self):
+        images = [Image([Section(idx * 0x100 + offset, bytearray([idx]) * 0x80) for offset in (0, 0x80)]) for idx in range(50)]
+        sections, overlaps = self.merged(images, "error")
+        self.assertEqual([(address, len(data)) for address, data in sections], [(0, 50 * 0x100)])
+
+
+class TestTransforms(unittest.TestCase):
+
+    def setUp(self):
+        self.image = Image([Section(0x1003, b"abc"), Section(0x1010, b"xyz"), Section(0x2000, b"q")])
+
+    def sections(self, image):
+        return [(s.address, bytes(s.data)) for s in image]
+
+    def testFill(self):
+        image = self.image.fill(0xff, alignment = 4, maxGap = 0x100)
+        self.assertEqual(self.sections(image), [(0x1000, b"\xff\xff\xffabc" + b"\xff" * 10 + b"xyz\xff"), (0x2000, b"q\xff\xff\xff")])
+        self.assertEqual(self.sections(self.image)[0], (0x1003, b"abc"))  # Unchanged.
+
+    def testFillAllGaps(self):
+        image = self.image.fill(0x00)
+        self.assertEqual(len(image), 1)
+        self.assertEqual(image.read(0x1003, 0xffe), bytearray(b"abc" + b"\x00" * 10 + b"xyz" + b"\x00" * 0xfed + b"q"))
+
+    def testCrop(self):
+        self.assertEqual(self.sections(self.image.crop(0x1004, 0x10)), [(0x1004, b"bc"), (0x1010, b"xyz")])
+        self.assertEqual(self.sections(self.image.crop(0x1100, 0x100)), [])
+
+    def testRelocateAll(self):
+        self.assertEqual(self.sections(self.image.relocate(-0x1000)), [(0x03, b"abc"), (0x10, b"xyz"), (0x1000, b"q")])
+
+    def testRelocateRange(self):
+        image = self.image.relocate(0x8000, 0x1004, 0x0e)
+        self.assertEqual(self.sections(image), [(0x1003, b"a"), (0x1012, b"z"), (0x2000, b"q"), (0x9004, b"bc"), (0x9010, b"xy")])
+
+    def testRelocateConflicts(self):
+        self.assertRaises(InvalidAddressError, self.image.relocate, 0xff0, 0x1000, 0x20)
+        self.assertRaises(InvalidAddressError, self.image.relocate, -0x2000)
+
+    def testSplit(self):
+        image = Image([Section(0x0ffc, range(24))]).split(8)
+        self.assertEqual([(s.address, s.length) for s in image], [(0x0ffc, 4), (0x1000, 8), (0x1008, 8), (0x1010, 4)])
+        self.assertEqual(image.read(0x0ffc, 24), bytearray(range(24)))
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from objutils import dump, dumps, load, loads, probes
+from objutils.hexfile import MetaRecord
+from objutils.image import Builder
+import objutils.etek as etek
+import objutils.oui as oui
+
+SREC = """S00600004844521B
+S113B000576F77212044696420796F7520726561D8
+S113B0106C6C7920676F207468726F756768206143
+S9030000FC"""
+
+
+class TestOUI(unittest.TestCase):
+
+    def setUp(self):
+        self.image = loads("srec", SREC)
+        builder = Builder()
+        builder.addSegment(range(100), 0x20000)
+        self.image.sections.extend(builder.image.sections)
+
+    def contents(self, image):
+        return [(s.address, bytes(s.data)) for s in image]
+
+    def testRoundTrip(self):
+        data = dumps("oui", self.image)
+        image = loads("oui", data, verify = True)
+        self.assertTrue(image.valid)
+        self.assertEqual(self.contents(image), self.contents(self.image))
+        self.assertEqual(dict(image.meta), dict(self.image.meta))
+        self.assertEqual(dumps("srec", image, recordType = 1, startAddress = 0), dumps("srec", self.image, recordType = 1, startAddress = 0))
+
+    def testMetaChunkTypes(self):
+        records = [MetaRecord(101, 0x1000, u"SYMBOL 01 0000 \u00b5"), MetaRecord(102, None, b"raw"),
+                   MetaRecord(103, 0, bytearray(b"abc")), MetaRecord(104, None, [1, 2, 3]), MetaRecord(105, 7, None)]
+        for record in records:
+            self.image.meta[record.formatType].append(record)
+        meta = loads("oui", dumps("oui", self.image)).meta
+        for record in records:
+            self.assertEqual(meta[record.formatType], [record])
+            self.assertEqual(type(meta[record.formatType][0].chunk), type(record.chunk))
+
+    def testEtekSymbols(self):
+        symbols = list(etek.Reader().iterRecords(io.BytesIO(b"%0E300 main 1000\n%0E300 init 1010\n")))
+        self.image.meta[etek.SYMBOL].extend(symbols)
+        meta = loads("oui", dumps("oui", self.image)).meta
+        self.assertEqual(meta[etek.SYMBOL], symbols)
+        self.assertEqual(meta[etek.SYMBOL][0].chunk, " main 1000\n")
+
+    def testAlignment(self):
+        image = loads("oui", dumps("oui", self.image, alignment = 4096))
+        self.assertTrue(all(s.data.obj is image.sections[0].data.obj for s in image))
+        data = dumps("oui", self.image, alignment = 4096)
+        offsets = [oui.SECTION.unpack_from(data, oui.HEADER.size + i * oui.SECTION.size)[1] for i in range(2)]
+        self.assertEqual([o % 4096 for o in offsets], [0, 0])
+
+    def testMemoryMappedFile(self):
+        directory = tempfile.mkdtemp()
+        try:
+            fileName = os.path.join(directory, "image.oui")
+            with open(fileName, "wb") as fp:
+                dump("oui", fp, self.image)
+            with open(fileName, "rb") as fp:
+                image = load("oui", fp)
+            self.assertEqual(self.contents(image), self.contents(self.image))
+            image.sections[0].data[0] = 0   # Copy-on-write, the file is unchanged.
+            with open(fileName, "rb") as fp:
+                self.assertEqual(self.contents(load("oui", fp)), self.contents(self.image))
+        finally:
+            shutil.rmtree(directory)
+
+    def testCorruption(self):
+        data = bytearray(dumps("oui", self.image))
+        offset = oui.SECTION.unpack_from(data, oui.HEADER.size)[1]
+        data[offset] ^= 0xff
+        reader = oui.Reader()
+        self.assertFalse(reader.loads(data, verify = True).valid)
+        self.assertRaises(oui.InvalidContainerError, loads, "oui", data[ : 20])
+        self.assertRaises(oui.InvalidContainerError, loads, "oui", b"\x00" * 100)
+
+    @unittest.skipUnless(hasattr(os, 'writev'), "requires os.writev()")
+    def testPartialWrites(self):
+        writev = os.writev
+        calls = []
+
+        def shortWritev(fd, buffers):   # At most 7 bytes per call.
+            calls.append(len(buffers))
+            return os.write(fd, b''.join(bytes(b) for b in buffers)[ : 7])
+
+        buffers = [bytes(bytearray([i % 256])) * (i % 5) for i in range(3000)]
+        directory = tempfile.mkdtemp()
+        os.writev = shortWritev
+        try:
+            fileName = os.path.join(directory, "buffers.bin")
+            with open(fileName, "wb") as fp:
+                fp.write(b"head")
+                oui.writeBuffers(fp, buffers)
+                fp.write(b"tail")
+            with open(fileName, "rb") as fp:
+                self.assertEqual(fp.read(), b"head" + b''.join(buffers) + b"tail")
+            self.assertTrue(max(calls) <= oui.IOV_MAX)
+        finally:
+            os.writev = writev
+            shutil.rmtree(directory)
+
+    def testProbe(self):
+        self.assertEqual(probes(dumps("oui", self.image)), "oui")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from objutils import dumps, probe, probes, probe_candidates, reg
+from objutils.image import Builder
+from objutils.prober import Candidate, candidates
+from objutils.utils import createStringBuffer
+
+IHEX = """:10010000214601360121470136007EFE09D2190140
+:100110002146017E17C20001FF5F16002148011928
+:00000001FF
+"""
+
+CODECS = ("sig", "srec", "titxt", "emon52", "fpc", "mostec", "rca", "tek", "cosmac", "ash")
+
+
+class TestProbe(unittest.TestCase):
+
+    def setUp(self):
+        builder = Builder()
+        builder.addSegment(bytearray(range(256)) * 2, 0x1000)
+        self.image = builder.image
+
+    def testRoundTrip(self):
+        for codec in CODECS:
+            self.assertEqual(probes(dumps(codec, self.image)), codec)
+
+    def testAmbiguousSignatureIsConfirmed(self):
+        self.assertEqual(probes(IHEX), "ihex")
+        self.assertEqual(probes(dumps("sig", self.image)), "sig")
+
+    def testRankedCandidates(self):
+        ranked = probe_candidates(createStringBuffer(bytes(IHEX, "ascii")))
+        self.assertEqual([c.name for c in ranked], ["ihex", "sig"])
+        self.assertTrue(ranked[1].confidence < ranked[0].confidence)
+        self.assertTrue(ranked[0].confidence > 0.5)
+
+    def testUniqueSignature(self):
+        self.assertEqual(probe_candidates(createStringBuffer(b"S00600004844521B\n")), [Candidate("srec", 0.9)])
+
+    def testFilePositionIsRestored(self):
+        fp = createStringBuffer(bytes(IHEX, "ascii"))
+        self.assertEqual(probe(fp), "ihex")
+        self.assertEqual(fp.tell(), 0)
+
+    def testTruncatedLineIsIgnored(self):
+        header = bytes(IHEX, "ascii")[ : 60]
+        self.assertEqual(candidates(reg, header)[0], Candidate("ihex", 1.0))
+
+    def testUnknown(self):
+        self.assertEqual(probe_candidates(createStringBuffer(b"hello, world!\n")), [])
+        self.assertIsNone(probes("hello, world!\n"))
+        self.assertIsNone(probes(""))
+
+    def testUniqueSignatureIsConfirmed(self):
+        self.assertEqual(probe_candidates(createStringBuffer(b"Some notes about the build\n")), [])
+        self.assertIsNone(probes("Some notes about the build\n"))
+        self.assertIsNone(probe(createStringBuffer(b"\x00\x01\x02\x03ELF\n\xff\xfe\n")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import unittest
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from objutils.section import Section, Overlap, joinSections, iterRows
+
+
+class TestJoinSections(unittest.TestCase):
+
+    def join(self, sections, **kws):
+        return [(s.address, bytes(s.data)) for s in joinSections(sections, **kws)]
+
+    def testContiguousSectionsAreJoined(self):
+        sections = [Section(0x20, b"cd"), Section(0x10, b"ab"), Section(0x12, b"\x00"), Section(0x22, b"e")]
+        self.assertEqual(self.join(sections), [(0x10, b"ab\x00"), (0x20, b"cde")])
+
+    def testInputIsConsumed(self):
+        sections = [Section(0x10, b"ab"), Section(0x12, b"cd")]
+        joinSections(sections)
+        self.assertEqual(sections, [])
+
+    def testInputDataIsNotShared(self):
+        first, second = Section(0x10, b"ab"), Section(0x20, b"cd")
+        result = joinSections([first, second])
+        result[0].data[0] = 0
+        self.assertEqual(first.data, bytearray(b"ab"))
+        self.assertIsNot(result[1].data, second.data)
+
+    def testUnordered(self):
+        sections = [Section(0x20, b"cd"), Section(0x10, b"ab"), Section(0x12, b"ef")]
+        self.assertEqual(self.join(sections, orderSections = False), [(0x20, b"cd"), (0x10, b"abef")])
+
+    def testManySections(self):
+        sections = [Section(address, bytearray([address & 0xff])) for address in range(100000)]
+        result = joinSections(sections)
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].length, 100000)
+
+    def testOverlaps(self):
+        overlaps = []
+        sections = [Section(0x10, b"abcd"), Section(0x12, b"xyz"), Section(0x20, b"ab"), Section(0x20, b"ab")]
+        self.assertEqual(self.join(sections, overlaps = overlaps), [(0x10, b"abcd"), (0x12, b"xyz"), (0x20, b"ab"), (0x20, b"ab")])
+        self.assertEqual(overlaps, [Overlap(0x12, 2, False), Overlap(0x20, 2, True)])
+
+    def testEmpty(self):
+        self.assertEqual(joinSections([]), [])
+
+
+class TestCompactSection(unittest.TestCase):
+
+    def testNoInstanceDict(self):
+        self.assertFalse(hasattr(Section(0x1000, b"abc"), '__dict__'))
+
+    def testCopy(self):
+        data = bytearray(b"abc")
+        self.assertIsNot(Section(0x1000, data).data, data)
+        self.assertIs(Section(0x1000, data, copy = False).data, data)
+        view = memoryview(data)
+        self.assertIs(Section(0x1000, view, copy = False).data, view)
+        self.assertEqual(Section(0x1000, b"abc", copy = False).data, data)  # Other types are always copied.
+        self.assertEqual(Section(0x1000, view, copy = False).length, 3)
+
+    def testRepr(self):
+        self.assertEqual(repr(Section(0x1000, b"abc")), "Section(address = 0X00001000, length = 3, data = b'abc')")
+
+
+class TestViews(unittest.TestCase):
+
+    def testView(self):
+        section = Section(0x1000, b"abcdef")
+        view = section.view(2, 3)
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(view.tobytes(), b"cde")
+        self.assertEqual(section.view().tobytes(), b"abcdef")
+        section.data[2] = ord("C")
+        self.assertEqual(view.tobytes(), b"Cde")    # No copy.
+
+    def testIterRows(self):
+        rows = [(address, bytes(row)) for address, row in iterRows(Section(0x1000, range(40)), 16)]
+        self.assertEqual([address for address, _ in rows], [0x1000, 0x1010, 0x1020])
+        self.assertEqual(rows[2][1], bytes(bytearray(range(32, 40))))
+
+    def testIterRowsProtocol(self):
+
+        class Protocol(object):
+            address = 0x2000
+            data = [1, 2, 3]
+            length = 3
+
+        self.assertEqual([(address, list(row)) for address, row in iterRows(Protocol(), 2)], [(0x2000, [1, 2]), (0x2002, [3])])
+
+
+
+@unittest.skipUnless(tracemalloc, "requires tracemalloc")
+class TestSectionMemory(unittest.TestCase):
+    """Bytes per section; the former `__dict__` and `reprlib.Repr` based sections took about 390 bytes
+    each (Python 3, 16 bytes of data).
+    """
+
+    COUNT = 10000
+
+    def bytesPerSection(self, copy):
+        chunks = [bytearray(16) for _ in range(self.COUNT)]
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            sections = [Section(idx * 16, chunk, copy = copy) for idx, chunk in enumerate(chunks)]
+            return (tracemalloc.get_traced_memory()[0] - before) / float(len(sections))
+        finally:
+            tracemalloc.stop()
+
+    def testCopy(self):
+        self.assertLess(self.bytesPerSection(True), 200)
+
+    def testAdopt(self):
+        self.assertLess(self.bytesPerSection(False), 120)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+import sys
+import unittest
+
+IMPORT_BUDGET = 0.25    # Seconds, generous enough for slow CI machines.
+
+SCRIPT = """
+import sys, time
+start = time.time()
+import objutils
+print(time.time() - start)
+print(sorted(m for m in sys.modules if m.startswith('objutils.')))
+"""
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+
+
+def runScript(script):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([ROOT] + [p for p in [env.get('PYTHONPATH')] if p])
+    return subprocess.check_output([sys.executable, "-c", script], env = env).decode().splitlines()
+
+
+class TestStartup(unittest.TestCase):
+
+    def testImportTime(self):
+        elapsed = min(float(runScript(SCRIPT)[0]) for _ in range(3))
+        self.assertLess(elapsed, IMPORT_BUDGET)
+
+    def testCodecsAreNotImported(self):
+        modules = runScript(SCRIPT)[1]
+        for name in ("hexfile", "srec", "ihex", "image", "section"):
+            self.assertNotIn("'objutils.{0}'".format(name), modules)
+
+    def testCodecIsImportedOnFirstUse(self):
+        lines = runScript(SCRIPT + "objutils.reg.get('srec')\nprint('objutils.srec' in sys.modules)\n")
+        self.assertEqual(lines[-1], "True")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -41,6 +41,7 @@ from objutils.utils import PYTHON_VERSION
 class Reader(hexfile.ASCIIHexReader):
     """
     """
+    SIGNATURES = (b'@', )
 
     def __init__(self, addressPattern = r'^@(?P<address>[0-9a-zA-Z]{2,8})\s*$',
                  dataPattern = r'^(?:[0-9a-zA-Z]{{2,4}}[{0}]?)*\s*$', etxPattern = r'^q.*$'):
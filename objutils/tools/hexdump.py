@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+from __future__ import print_function
+
+__version__ = "0.1.0"
+
+__copyright__ = """
+    pyObjUtils - Object file library for Python.
+
+   (C) 2010-2016 by Christoph Schueler <cpu12.gems@googlemail.com>
+
+   All Rights Reserved
+
+  This program is free software; you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation; either version 2 of the License, or
+  (at your option) any later version.
+
+  This program is distributed in the hope that it will be useful,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+
+  You should have received a copy of the GNU General Public License along
+  with this program; if not, write to the Free Software Foundation, Inc.,
+  51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+"""
+
+import sys
+from optparse import OptionParser
+
+from objutils.hexdump import dumpFile, Layout
+
+
+def toInt(option, opt, value, parser):
+    try:
+        setattr(parser.values, option.dest, int(value, 0))
+    except ValueError:
+        parser.error("option {0}: invalid number '{1}'".format(opt, value))
+
+
+def main(args = None):
+    usage = "Usage: hexdump.py [options] <file>"
+    op = OptionParser(usage = usage, version = "%prog " + __version__, description = "Canonical hexdump of (huge) binary files")
+    op.add_option('-s', '--skip', help = "Skip OFFSET bytes from the beginning of the file", dest = "offset",
+        action = "callback", callback = toInt, type = "string", default = 0, metavar = "OFFSET")
+    op.add_option('-n', '--length', help = "Dump only LENGTH bytes", dest = "length",
+        action = "callback", callback = toInt, type = "string", default = None, metavar = "LENGTH")
+    op.add_option('-a', '--address', help = "Address of the first byte dumped (default: OFFSET)", dest = "address",
+        action = "callback", callback = toInt, type = "string", default = None, metavar = "ADDRESS")
+    op.add_option('-w', '--address-bits', help = "Width of addresses in bits (default: 32)", dest = "addressBits",
+        type = "int", default = 32)
+    op.add_option('-r', '--row-length', help = "Bytes per row (default: 16)", dest = "rowLength", type = "int", default = 16)
+    op.add_option('-g', '--word-size', help = "Group bytes into words of 1, 2, 4 or 8 bytes (default: 1)", dest = "wordSize",
+        type = "int", default = 1)
+    op.add_option('-b', '--big-endian', help = "Words are big endian (default: little endian)", dest = "bigEndian",
+        action = "store_true", default = False)
+    op.add_option('-c', '--compact', help = "Omit the ASCII column", dest = "compact", action = "store_true", default = False)
+    (options, args) = op.parse_args(args)
+    if len(args) != 1:
+        op.error("exactly one file is required")
+    try:
+        layout = Layout(options.rowLength, options.wordSize, "big" if options.bigEndian else "little", not options.compact)
+    except ValueError as e:
+        op.error(str(e))
+    try:
+        dumpFile(args[0], sys.stdout, options.offset, options.length, options.address, options.addressBits, layout)
+    except (IOError, OSError, ValueError) as e:
+        print("hexdump.py: {0!s}".format(e), file = sys.stderr)
+        return 1
+    return 0
+
+if __name__=='__main__':
+    sys.exit(main())
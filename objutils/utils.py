@@ -47,6 +47,18 @@ def makeList(*args):
     return result
 
 
+def makeBytes(*args):
+    """Like `makeList`, but builds a `bytearray` (all values must fit into a byte).
+    """
+    result = bytearray()
+    for arg in args:
+        if hasattr(arg, '__iter__'):
+            result.extend(arg)
+        else:
+            result.append(arg)
+    return result
+
+
 def intToArray(value):
     result = []
     while value:
@@ -147,12 +159,12 @@ class StructureWithEnums(ctypes.Structure):
     __repr__ = __str__
 
 
-import subprocess
-
 class CommandError(Exception):
     pass
 
 def runCommand(cmd):
+    import subprocess   # Not needed by the codecs, keep it out of 'import objutils'.
+
     proc = subprocess.Popen(cmd, shell = True, stdout = subprocess.PIPE, stderr = subprocess.PIPE)
     result = proc.communicate()
     proc.wait()
@@ -198,8 +210,19 @@ class RepresentationMixIn(object):
 
 import mmap
 
-def memoryMap(filename, writeable = False):
+def memoryMap(filename, writeable = False, copyOnWrite = False):
+    """Map `filename` into memory; with `copyOnWrite` the mapping is writable, but changes don't go to the file.
+    """
     size = os.path.getsize(filename)
     fd = os.open(filename, os.O_RDWR if writeable else os.O_RDONLY)
-    return mmap.mmap(fd, size, access = mmap.ACCESS_WRITE if writeable else mmap.ACCESS_READ)
+    if writeable:
+        access = mmap.ACCESS_WRITE
+    elif copyOnWrite:
+        access = mmap.ACCESS_COPY
+    else:
+        access = mmap.ACCESS_READ
+    try:
+        return mmap.mmap(fd, size, access = access)
+    finally:
+        os.close(fd)    # The mapping keeps its own reference to the file.
 
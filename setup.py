@@ -20,6 +20,7 @@ setup(
     entry_points = {
         'console_scripts': [
                 'readelf.py = objutils.tools.readelf:main',
+                'hexdump.py = objutils.tools.hexdump:main',
         ],
     },
     #data_files = [